@@ -0,0 +1,311 @@
+"""
+Sound effects for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Every tone is synthesized once into a 16-bit mono PCM buffer and cached
+for each volume level, so playing a sound never generates anything.
+Sounds are handed to a mixer that adds all playing sounds together in
+10 ms blocks and streams the result to the sound device; overlapping
+sounds are heard at the same time instead of waiting for each other, and
+a new sound starts within a block or two.
+
+Backends, best first:
+
+- SoundDeviceBackend: the optional sounddevice package, on any system
+- PipeBackend: streams to the aplay command on Linux
+- WinsoundBackend: plays cached WAV files asynchronously through the
+  Windows sound API; Windows can't mix these, so a new sound replaces the
+  one playing
+- NullBackend: silent, used when no sound device is usable
+"""
+from array import array
+import io
+import math
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+from paths import cache_dir
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+SAMPLE_RATE = 22050
+
+# Frames mixed at a time, 10 ms of sound
+BLOCK = SAMPLE_RATE // 100
+
+# Volume is rounded to this many steps so each step is synthesized once
+VOLUME_STEPS = 10
+
+# Most sounds mixed at once; the oldest is cut off to make room
+MAX_VOICES = 8
+
+# Fade in and out so tones start and stop without a click
+FADE = 0.005
+
+
+def synthesize(notes, volume):
+    """ 16-bit PCM samples of a sequence of (frequency, milliseconds) tones """
+    samples = array("h")
+    amplitude = 0.3 * volume * 32767
+    fade = int(SAMPLE_RATE * FADE)
+    for frequency, duration in notes:
+        frames = SAMPLE_RATE * duration // 1000
+        step = 2 * math.pi * frequency / SAMPLE_RATE
+        for n in range(frames):
+            envelope = min(1.0, n / fade, (frames - n) / fade)
+            samples.append(int(amplitude * envelope * math.sin(step * n)))
+    return samples
+
+
+class Sound:
+    """ A synthesized sound: PCM samples, and a WAV file when one is needed """
+
+    def __init__(self, key, samples):
+        """ key names the sound and its volume, e.g. "click-quick-7" """
+        self.key = key
+        self.samples = samples
+
+    def wav(self):
+        """ The sound as the bytes of a WAV file """
+        data = io.BytesIO()
+        with wave.open(data, "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(SAMPLE_RATE)
+            file.writeframes(self.samples.tobytes())
+        return data.getvalue()
+
+
+class Mixer:
+    """ Adds up the sounds that are playing, one block at a time """
+
+    def __init__(self):
+        """ Start with nothing playing """
+        self.voices = []
+        self.lock = threading.Lock()
+        self.active = threading.Event()
+
+    def add(self, sound):
+        """ Start playing a sound on top of whatever is playing """
+        with self.lock:
+            if len(self.voices) >= MAX_VOICES:
+                self.voices.pop(0)
+            self.voices.append([sound.samples, 0])
+        self.active.set()
+
+    def mix(self, frames):
+        """ The next frames of mixed sound as bytes, or None when silent """
+        with self.lock:
+            voices = self.voices
+            if not voices:
+                self.active.clear()
+                return None
+            out = [0] * frames
+            for voice in voices:
+                samples, position = voice
+                chunk = samples[position:position + frames]
+                for n, value in enumerate(chunk):
+                    out[n] += value
+                voice[1] = position + len(chunk)
+            self.voices = [voice for voice in voices if voice[1] < len(voice[0])]
+        return array("h", [max(-32768, min(32767, value)) for value in out]).tobytes()
+
+
+class NullBackend:
+    """ Plays nothing, for systems without a usable sound device """
+
+    def play(self, sound):
+        """ Ignore the sound """
+
+
+class SoundDeviceBackend:
+    """ Mixes sounds into a low latency sounddevice output stream """
+
+    def __init__(self):
+        """ Open the default output device; raises if there is none """
+        import sounddevice
+
+        self.mixer = Mixer()
+        self.stream = sounddevice.RawOutputStream(
+            samplerate=SAMPLE_RATE, channels=1, dtype="int16", blocksize=BLOCK,
+            latency="low", callback=self.fill)
+        self.stream.start()
+
+    def fill(self, buffer, frames, time_info, status):
+        """ Stream callback: hand the device the next block """
+        data = self.mixer.mix(frames) or bytes(2 * frames)
+        buffer[:len(data)] = data
+
+    def play(self, sound):
+        """ Mix the sound in from the next block """
+        self.mixer.add(sound)
+
+
+class PipeBackend:
+    """ Mixes sounds and streams them to an external player command """
+
+    # Most sound written ahead of the clock, which bounds the latency
+    lead = 0.02
+
+    def __init__(self, command):
+        """ command reads raw 16-bit mono PCM at SAMPLE_RATE from stdin """
+        self.command = command
+        self.mixer = Mixer()
+        self.process = None
+        self.failed = False
+        self.writer = None
+
+    def play(self, sound):
+        """ Mix the sound in, starting the player and writer if needed """
+        if self.failed:
+            return
+        self.mixer.add(sound)
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run, daemon=True)
+            self.writer.start()
+
+    def run(self):
+        """ Writer loop: stream mixed blocks while anything is playing """
+        try:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                            stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+            while True:
+                self.mixer.active.wait()
+                start = time.monotonic()
+                written = 0
+                while True:
+                    data = self.mixer.mix(BLOCK)
+                    if data is None:
+                        break
+                    self.process.stdin.write(data)
+                    self.process.stdin.flush()
+                    written += BLOCK
+
+                    # Stay just ahead of the device so new sounds are not
+                    # stuck behind a long backlog in the pipe
+                    ahead = written / SAMPLE_RATE - (time.monotonic() - start)
+                    if ahead > self.lead:
+                        time.sleep(ahead - self.lead)
+        except OSError:
+            # The player is missing or went away: stay quiet from now on
+            self.failed = True
+
+
+class WinsoundBackend:
+    """ Plays WAV files asynchronously through the Windows sound API """
+
+    def __init__(self):
+        """ WAV files are written to the cache folder by prepare() """
+        self.directory = os.path.join(cache_dir(), "sounds")
+        self.paths = {}
+
+    def path_for(self, sound):
+        """ The WAV file of a sound, written if it isn't there yet """
+        path = self.paths.get(sound.key)
+        if path is None:
+            path = os.path.join(self.directory, f"{sound.key}.wav")
+            if not os.path.exists(path):
+                os.makedirs(self.directory, exist_ok=True)
+                with open(path + ".tmp", "wb") as file:
+                    file.write(sound.wav())
+                os.replace(path + ".tmp", path)
+            self.paths[sound.key] = path
+        return path
+
+    def prepare(self, sound):
+        """ Write a sound's WAV file now, so playing it never touches the disk """
+        try:
+            self.path_for(sound)
+        except OSError:
+            # Tried again when the sound is played
+            pass
+
+    def play(self, sound):
+        """ Start the sound and return at once """
+        try:
+            winsound.PlaySound(self.path_for(sound), winsound.SND_FILENAME |
+                               winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+        except (RuntimeError, OSError):
+            pass
+
+
+def default_backend():
+    """ The best sound backend available on this system """
+    try:
+        return SoundDeviceBackend()
+    except Exception:
+        # Not installed, or no output device
+        pass
+    if sys.platform.startswith("linux") and shutil.which("aplay"):
+        return PipeBackend(["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1",
+                            "-r", str(SAMPLE_RATE), "--buffer-time=20000"])
+    if winsound is not None:
+        return WinsoundBackend()
+    return NullBackend()
+
+
+class SoundPlayer:
+    """ Plays the game's sound effects from a cache of synthesized buffers """
+
+    # Clicks closer together than this are played shorter
+    rapid_click = 0.5
+
+    def __init__(self, sounds, backend=None, volume=1.0):
+        """ sounds maps sound names to their base frequency """
+        self.sounds = sounds
+        self.backend = backend or default_backend()
+        self.cache = {}
+        self.last_click = 0.0
+        self.set_volume(volume)
+
+    def set_volume(self, volume):
+        """ Volume from 0 to 1, rounded to one of VOLUME_STEPS levels """
+        self.level = round(max(0.0, min(volume, 1.0)) * VOLUME_STEPS)
+
+    def play(self, name):
+        """ Start a sound right away, mixed with any that are playing """
+        # Rapid clicks, e.g. while clearing an area, get a shorter beep
+        quick = False
+        if name == "click":
+            now = time.monotonic()
+            quick = now - self.last_click < self.rapid_click
+            self.last_click = now
+        if self.level:
+            self.backend.play(self.sound(name, quick))
+
+    def sound(self, name, quick=False):
+        """ The synthesized sound at the current volume, made on first use """
+        key = f"{name}{'-quick' if quick else ''}-{self.level}"
+        if key not in self.cache:
+            notes = self.notes(name, quick)
+            self.cache[key] = Sound(key, synthesize(notes, self.level / VOLUME_STEPS))
+        return self.cache[key]
+
+    def preload(self):
+        """ Synthesize every sound at the current volume ahead of time, and
+        let the backend get ready to play them (e.g. write their files) """
+        sounds = [self.sound(name) for name in self.sounds]
+        sounds.append(self.sound("click", quick=True))
+        prepare = getattr(self.backend, "prepare", None)
+        if prepare is not None:
+            for sound in sounds:
+                prepare(sound)
+
+    def notes(self, name, quick=False):
+        """ (frequency, milliseconds) of each tone of a sound """
+        frequency = self.sounds[name]
+        if name == "win":
+            # Victory melody
+            return [(frequency, 150), (frequency + 200, 150), (frequency + 400, 150)]
+        if name == "lose":
+            return [(frequency, 500)]
+        return [(frequency, 50 if quick else 150)]
@@ -0,0 +1,64 @@
+"""
+Benchmarks of the board engine hot paths
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Each benchmark covers the engine code that replaced one of the game's
+original methods:
+
+- create_mine: Board.prepare() and arm() - placing the mines and moving
+  them off the first click
+- check_mines: Board.count_mines() - the neighbour counts
+- clear_surr: Board.reveal() on the first click - the flood fill
+- give_hint: the solver, then mine probabilities when nothing is certain
+"""
+from support import SEED, make_board
+
+from board import Board
+from probability import mine_probabilities
+from solver import Solver
+
+
+def bench_create_mine(benchmark, size, density):
+    """ Generate and arm a board """
+    board = benchmark(make_board, size, density)
+    assert board.is_armed
+
+
+def bench_check_mines(benchmark, size, density):
+    """ Count the mines around every cell """
+    board = make_board(size, density, armed=False)
+    board.prepare()
+    benchmark(board.count_mines)
+    assert len(board.counts) == board.cells
+
+
+def bench_clear_surr(benchmark, size, density):
+    """ Reveal the first click, opening its empty region """
+    board = make_board(size, density)
+    benchmark.pedantic(board.reveal, args=board.first_click, setup=board.reset,
+                       rounds=100, warmup_rounds=5)
+    assert board.revealed_count > 0
+
+
+def bench_give_hint(benchmark, size, density):
+    """ Find a hint on a board after the first click, as give_hint does """
+    board = make_board(size, density)
+    board.reveal(*board.first_click)
+    revealed = [i for i in range(board.cells) if board.revealed[i]]
+
+    def hint():
+        solver = Solver(board)
+        solver.update(revealed)
+        safe, mines = solver.solve()
+        if safe or mines:
+            return next(iter(safe or mines))
+        return mine_probabilities(solver).safest()
+
+    assert benchmark(hint) is not None
+
+
+def bench_game_id_roundtrip(benchmark, size, density):
+    """ Rebuild a board from its game ID """
+    game_id = make_board(size, density).game_id
+    board = benchmark(Board.from_game_id, game_id)
+    assert board.seed == SEED
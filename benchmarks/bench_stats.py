@@ -0,0 +1,60 @@
+"""
+Benchmarks of the game statistics queries
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+The store is filled with GAMES random games once per session; every query
+the high score screen and the game over window make must stay in the
+millisecond range at that size.
+"""
+from random import Random
+
+import pytest
+
+from support import SEED
+
+from stats import StatsStore
+
+# Games in the benchmark database
+GAMES = 100000
+
+
+@pytest.fixture(scope="session")
+def store(tmp_path_factory):
+    """ A stats database holding GAMES games across the difficulties """
+    store = StatsStore(str(tmp_path_factory.mktemp("stats") / "stats.sqlite3"), legacy_path=None)
+    rng = Random(SEED)
+    rows = [(rng.choice(("easy", "medium", "hard", "custom")), rng.random() < 0.4,
+             rng.randint(5, 999), rng.randint(10, 400), rng.randint(0, 3), rng.randint(0, 400),
+             f"{rng.getrandbits(48):x}", f"2025-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}")
+            for _ in range(GAMES)]
+    with store.db:
+        store.db.executemany("INSERT INTO games (difficulty, won, time, clicks, hints, "
+                             "revealed, game_id, date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    yield store
+    store.close()
+
+
+def bench_leaderboard(benchmark, store):
+    """ The top 5 wins of a difficulty """
+    assert len(benchmark(store.leaderboard, "hard")) == 5
+
+
+def bench_rank(benchmark, store):
+    """ Whether a win makes the top 5 """
+    benchmark(store.rank, "hard", 100)
+
+
+def bench_percentile(benchmark, store):
+    """ How a win compares with all the others """
+    assert 0 <= benchmark(store.percentile, "hard", 500) <= 100
+
+
+def bench_median(benchmark, store):
+    """ The median winning time """
+    assert benchmark(store.time_at, "hard", 0.5) is not None
+
+
+def bench_record(benchmark, store):
+    """ Store one finished game """
+    benchmark(store.record, "easy", True, 42, clicks=30, hints=1, revealed=71,
+              game_id="9x9-10-3f2a-4.4")
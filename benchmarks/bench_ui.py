@@ -0,0 +1,62 @@
+"""
+Benchmarks of building the game grid
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Times what start() does to put a board on screen: creating the renderer
+and drawing its tiles. Boards from 20x20 up use the scrolling renderer,
+as hard mode does, so only the cells in view get canvas items. These need
+a display and are skipped without one.
+"""
+import os
+
+import pytest
+
+from support import ROOT, make_board
+
+from renderer import TileRenderer, VirtualTileRenderer
+from tiles import TileFiles
+
+
+@pytest.fixture(scope="module")
+def images(tk_root):
+    """ The classic tile images """
+    path = os.path.join(ROOT, "images")
+    return TileFiles({
+        "tile": os.path.join(path, "unclicked_tile.png"),
+        "mine": os.path.join(path, "unclicked_mine_tile.png"),
+        "flag": os.path.join(path, "flag_tile.png"),
+        "clicked_mine": os.path.join(path, "clicked_mine_tile.png"),
+        "wrong_flag": os.path.join(path, "wrong_flag_tile.png"),
+        "hint": os.path.join(path, "flag_tile.png")
+    }, [os.path.join(path, f"num{i}_tile.png") for i in range(9)]).load("dark")
+
+
+def bench_start(benchmark, tk_root, images, size):
+    """ Create the renderer for a new game and draw it """
+    from tkinter import Frame
+
+    board = make_board(size, 0.16, armed=False)
+    frames = []
+
+    def setup():
+        # Throw away the grid of the previous round, as restart used to
+        for frame in frames:
+            frame.destroy()
+        frames[:] = [Frame(tk_root)]
+        frames[0].pack()
+        return (frames[0],), {}
+
+    def build(frame):
+        if size >= 20:
+            renderer = VirtualTileRenderer(frame, board, images)
+            renderer.pack()
+            tk_root.update_idletasks()
+            renderer.update_viewport()
+        else:
+            renderer = TileRenderer(frame, board, images)
+            renderer.pack()
+        tk_root.update_idletasks()
+        return renderer
+
+    renderer = benchmark.pedantic(build, setup=setup, rounds=10, warmup_rounds=1)
+    assert renderer.drawn_cells()
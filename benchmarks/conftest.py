@@ -0,0 +1,54 @@
+"""
+Shared setup for the Minesweeper benchmarks
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Run from the repository root:
+
+    pytest benchmarks --benchmark-save=baseline     # record a baseline
+    pytest benchmarks --benchmark-compare           # fail on regressions
+
+Baselines are JSON files in benchmarks/baselines, one folder per machine;
+a comparison fails when a benchmark's best time is more than 25% slower
+than the latest baseline (REGRESSION_THRESHOLD, or pass your own with
+--benchmark-compare-fail). The UI benchmarks need a display - run them under a
+virtual one with "xvfb-run pytest benchmarks" - and are skipped without one.
+Helpers the benchmark modules import are in support.py.
+"""
+import pytest
+
+# Board sizes and mine densities every engine benchmark runs at
+SIZES = (9, 16, 20, 100, 500)
+DENSITIES = (0.12, 0.16, 0.2)
+
+# How much slower than the baseline a benchmark may get before it fails
+REGRESSION_THRESHOLD = "min:25%"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """ Fail comparisons on regressions unless a threshold was given """
+    if config.getoption("benchmark_compare", None) and \
+            not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+def pytest_generate_tests(metafunc):
+    """ Run every benchmark taking size/density at each of them """
+    if "size" in metafunc.fixturenames:
+        metafunc.parametrize("size", SIZES)
+    if "density" in metafunc.fixturenames:
+        metafunc.parametrize("density", DENSITIES)
+
+
+@pytest.fixture(scope="session")
+def tk_root():
+    """ A Tk root window, or skip when there is no display """
+    tkinter = pytest.importorskip("tkinter")
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as error:
+        pytest.skip(f"no display available: {error}")
+    yield root
+    root.destroy()
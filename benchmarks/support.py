@@ -0,0 +1,23 @@
+"""
+Helpers shared by the Minesweeper benchmarks
+Developed by Muhammad Saeed (https://github.com/mid0o)
+"""
+import os
+import sys
+
+# Benchmarks import the game modules from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from board import Board  # noqa: E402
+
+# Fixed seed so every run times the same boards
+SEED = 0x5EED
+
+
+def make_board(size, density, armed=True):
+    """ A square board with the given mine density, armed at its centre """
+    board = Board(size, size, round(size * size * density), seed=SEED)
+    if armed:
+        board.arm(size // 2, size // 2)
+    return board
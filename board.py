@@ -0,0 +1,447 @@
+"""
+Minesweeper board engine
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+The board keeps all game state in flat bytearrays (one byte per cell) so
+it can run without Tk, a display or any widgets. Cells are addressed either
+by (x, y) - row and column, the same order the UI grid uses - or by their
+flat index x * cols + y.
+
+NumPy is used for the bulk neighbour count when it is installed; the pure
+Python fallback gives the same result.
+
+A board is fully described by its game ID - size, mine count, seed and
+first click - which regenerates exactly the same layout. pack()/unpack()
+store a board as a small header followed by a bitset of the mines.
+"""
+from array import array
+from itertools import chain
+from random import Random, SystemRandom
+import re
+import struct
+import zlib
+
+# Packed board header: magic, rows, cols, mines, seed, first click index
+PACK_HEADER = struct.Struct("<4sIIIQi")
+PACK_MAGIC = b"MSB1"
+
+# bytes.translate tables between 0/1 bytes and "0"/"1" characters
+TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# bytes.translate table mapping every non-zero byte to 1
+NONZERO = bytes([0]) + bytes([1]) * 255
+
+# Runs of zero bytes, used by the flood fill to find whole runs of cells
+ZERO_RUNS = re.compile(b"\x00+")
+
+# Reveals bigger than this rebuild the frontier with NumPy
+FRONTIER_REBUILD = 4096
+
+# Boards up to this many cells share a precomputed neighbour table; only
+# the table of the latest size is kept, so custom sizes don't pile up
+NEIGHBOUR_TABLE_LIMIT = 65536
+neighbour_tables = {}
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Board:
+    """ Game state for a single board """
+
+    def __init__(self, rows, cols, mines, seed=None):
+        """ Create an empty, unarmed board """
+        self.rows = rows
+        self.cols = cols
+        self.cells = rows * cols
+        self.mine_count = mines
+
+        # Every board gets a seed so its game ID can reproduce it
+        if seed is None:
+            seed = SystemRandom().getrandbits(48)
+        self.seed = seed
+        self.rng = Random(seed)
+        self.first_click = None
+
+        # Small boards look neighbours up instead of computing them
+        self.neighbour_table = None
+        if self.cells <= NEIGHBOUR_TABLE_LIMIT:
+            if (rows, cols) not in neighbour_tables:
+                neighbour_tables.clear()
+                neighbour_tables[(rows, cols)] = tuple(
+                    self._compute_neighbours(i) for i in range(self.cells))
+            self.neighbour_table = neighbour_tables[(rows, cols)]
+
+        # One byte per cell for every layer of state
+        self.mines = bytearray(self.cells)
+        self.revealed = bytearray(self.cells)
+        self.flagged = bytearray(self.cells)
+        self.counts = bytearray(self.cells)
+
+        # Mines are placed (prepared) before the first click if the board
+        # was made ahead of time, and the board is armed once that click
+        # has moved any mines out of the way
+        self.prepared = False
+        self.is_armed = False
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.exploded = None
+
+        # Hidden cells next to revealed ones, kept up to date by every
+        # reveal so the solver never has to scan the grid
+        self.frontier = set()
+
+    def index(self, x, y):
+        """ Flat index of the cell at (x, y) """
+        return x * self.cols + y
+
+    def coords(self, i):
+        """ (x, y) of the cell at flat index i """
+        return divmod(i, self.cols)
+
+    def neighbours(self, i):
+        """ Flat indices of the cells around cell i """
+        if self.neighbour_table is not None:
+            return self.neighbour_table[i]
+        return self._compute_neighbours(i)
+
+    def _compute_neighbours(self, i):
+        """ Neighbours of cell i worked out from its coordinates """
+        x, y = divmod(i, self.cols)
+        result = []
+        for nx in range(max(x - 1, 0), min(x + 2, self.rows)):
+            for ny in range(max(y - 1, 0), min(y + 2, self.cols)):
+                if nx != x or ny != y:
+                    result.append(nx * self.cols + ny)
+        return tuple(result)
+
+    def prepare(self):
+        """ Place the mines and count them before the first click is known """
+        if self.mine_count >= self.cells:
+            raise ValueError(f"Cannot place {self.mine_count} mines "
+                             f"and keep a cell free in {self.cells} cells")
+        self.place_mines()
+        self.count_mines()
+        self.prepared = True
+
+    def arm(self, x, y):
+        """ Finish the layout for a first click at (x, y) """
+        if not self.prepared:
+            self.prepare()
+        self.first_click = (x, y)
+        self.clear_area(x, y)
+        self.is_armed = True
+
+    def clear_area(self, x, y):
+        """ Move mines off (x, y) and its neighbours, or just (x, y) if crowded """
+        first = self.index(x, y)
+        area = [first, *self.neighbours(first)]
+        if self.mine_count > self.cells - len(area):
+            area = [first]
+
+        # Each displaced mine goes to a uniformly chosen free cell outside
+        # the area, which keeps every final layout equally likely
+        blocked = set(area)
+        for i in area:
+            if not self.mines[i]:
+                continue
+            while True:
+                target = self.rng.randrange(self.cells)
+                if not self.mines[target] and target not in blocked:
+                    break
+            self.move_mine(i, target)
+
+    def place_mines(self, excluded=()):
+        """ Place exactly mine_count mines, none of them on excluded cells """
+        excluded = sorted(set(excluded))
+        free = self.cells - len(excluded)
+        if not 0 <= self.mine_count <= free:
+            raise ValueError(f"Cannot place {self.mine_count} mines "
+                             f"in {free} free cells")
+
+        # Every set of mine_count free cells is equally likely: sample
+        # positions among the free cells only, then step over the
+        # excluded ones to get the real cell index
+        self.mines = bytearray(self.cells)
+        for i in self.rng.sample(range(free), self.mine_count):
+            for skipped in excluded:
+                if i >= skipped:
+                    i += 1
+                else:
+                    break
+            self.mines[i] = 1
+
+    def count_mines(self):
+        """ Count the mines around every cell (mine cells included) """
+        if numpy is not None:
+            self.counts = self._count_mines_numpy()
+        else:
+            self.counts = self._count_mines_python()
+
+    def _count_mines_numpy(self):
+        """ Neighbour counts as a sum of the eight shifted mine masks """
+        mines = numpy.frombuffer(bytes(self.mines), dtype=numpy.uint8)
+        padded = numpy.pad(mines.reshape(self.rows, self.cols), 1)
+        counts = numpy.zeros((self.rows, self.cols), dtype=numpy.uint8)
+        for dx in range(3):
+            for dy in range(3):
+                if dx != 1 or dy != 1:
+                    counts += padded[dx:dx + self.rows, dy:dy + self.cols]
+        return bytearray(counts.tobytes())
+
+    def _count_mines_python(self):
+        """ Neighbour counts from row-wise horizontal and vertical sums """
+        cols = self.cols
+        zeros = [0] * cols
+
+        # Mines in each cell plus its left and right neighbour
+        sums = []
+        for start in range(0, self.cells, cols):
+            row = self.mines[start:start + cols]
+            sums.append(list(map(lambda a, b, c: a + b + c,
+                                 chain((0,), row), row, chain(row[1:], (0,)))))
+
+        # Add the rows above and below, then take the cell itself out
+        counts = bytearray(self.cells)
+        for x in range(self.rows):
+            above = sums[x - 1] if x > 0 else zeros
+            below = sums[x + 1] if x + 1 < self.rows else zeros
+            start = x * cols
+            row = self.mines[start:start + cols]
+            counts[start:start + cols] = bytes(map(
+                lambda a, b, c, m: a + b + c - m, above, sums[x], below, row))
+        return counts
+
+    def move_mine(self, src, dst):
+        """ Move the mine at src to the empty cell dst, updating counts """
+        if not self.mines[src] or self.mines[dst]:
+            raise ValueError(f"Cannot move a mine from {src} to {dst}")
+
+        self.mines[src] = 0
+        for n in self.neighbours(src):
+            self.counts[n] -= 1
+        self.mines[dst] = 1
+        for n in self.neighbours(dst):
+            self.counts[n] += 1
+
+    def reveal(self, x, y):
+        """ Reveal the cell at (x, y) and return the indices that changed """
+        i = self.index(x, y)
+        if self.revealed[i] or self.flagged[i]:
+            return []
+
+        self.revealed[i] = 1
+        if self.mines[i]:
+            self.exploded = i
+            return [i]
+
+        # An empty cell opens the whole connected empty region at once;
+        # big regions are kept as a compact array of indices
+        changed = [i]
+        if self.counts[i] == 0:
+            changed = array("i", changed)
+            changed.extend(self._flood_fill(i))
+        self.revealed_count += len(changed)
+        self._update_frontier(changed)
+        return changed
+
+    def _update_frontier(self, changed):
+        """ Move newly revealed cells out of the frontier and add their neighbours """
+        # After a big flood fill it is quicker to find the whole frontier again
+        if numpy is not None and len(changed) > FRONTIER_REBUILD:
+            self.frontier = self._frontier_numpy()
+            return
+
+        frontier = self.frontier
+        frontier.difference_update(changed)
+
+        # Every neighbour of an empty cell is revealed with it, so only
+        # numbered cells can border hidden ones - unless a flag stopped
+        # the flood fill
+        revealed, counts = self.revealed, self.counts
+        flags = self.flag_count
+        for c in changed:
+            if counts[c] or flags:
+                for n in self.neighbours(c):
+                    if not revealed[n]:
+                        frontier.add(n)
+
+    def _flood_fill(self, start):
+        """ Reveal everything reachable from the empty cell start
+
+        The fill works on whole runs of empty cells in a row at a time: it
+        expands a run, then opens the hidden cells in the run's row and the
+        rows above and below it, one cell wider on each side. Byte
+        searches do the per-cell work, so even flooding most of a
+        1000x1000 board stays fast.
+        """
+        rows, cols = self.rows, self.cols
+        revealed = self.revealed
+
+        # Walls stop the fill (numbers and flags); closed cells are not
+        # opened (already revealed or flagged); done marks expanded runs
+        walls = self.counts.translate(NONZERO)
+        closed = bytearray(revealed)
+        if self.flag_count:
+            flagged = self.flagged
+            i = flagged.find(1)
+            while i != -1:
+                walls[i] = closed[i] = 1
+                i = flagged.find(1, i + 1)
+        done = bytearray(self.cells)
+
+        opened = array("i")
+        find_runs = ZERO_RUNS.finditer
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            if done[i]:
+                continue
+
+            # The run of empty cells through i, from left to right - 1
+            x = i // cols
+            row = x * cols
+            left = walls.rfind(1, row, i) + 1 or row
+            right = walls.find(1, i, row + cols)
+            if right < 0:
+                right = row + cols
+            done[left:right] = b"\x01" * (right - left)
+
+            first = max(left - row - 1, 0)
+            last = min(right - row + 1, cols)
+            for nx in range(max(x - 1, 0), min(x + 2, rows)):
+                a, b = nx * cols + first, nx * cols + last
+                for run in list(find_runs(closed, a, b)):
+                    s, e = run.span()
+                    closed[s:e] = revealed[s:e] = b"\x01" * (e - s)
+                    opened.extend(range(s, e))
+
+                # Empty runs touching this one above and below continue the fill
+                if nx != x:
+                    for run in find_runs(walls, a, b):
+                        if not done[run.start()]:
+                            stack.append(run.start())
+        return opened
+
+    def _frontier_numpy(self):
+        """ Hidden cells next to a revealed cell, found with array operations """
+        rows, cols = self.rows, self.cols
+        revealed = numpy.frombuffer(bytes(self.revealed), dtype=bool).reshape(rows, cols)
+        padded = numpy.pad(revealed, 1)
+        near = numpy.zeros((rows, cols), dtype=bool)
+        for dx in range(3):
+            for dy in range(3):
+                near |= padded[dx:dx + rows, dy:dy + cols]
+        return set(numpy.flatnonzero(near & ~revealed).tolist())
+
+    def toggle_flag(self, x, y):
+        """ Flag or unflag the cell at (x, y), returns False if revealed """
+        i = self.index(x, y)
+        if self.revealed[i]:
+            return False
+
+        if self.flagged[i]:
+            self.flagged[i] = 0
+            self.flag_count -= 1
+        else:
+            self.flagged[i] = 1
+            self.flag_count += 1
+        return True
+
+    def reset(self):
+        """ Hide every cell again but keep the mines where they are """
+        self.revealed = bytearray(self.cells)
+        self.flagged = bytearray(self.cells)
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.exploded = None
+        self.frontier = set()
+
+    def snapshot(self):
+        """ The player's progress so far, for restore(); mines are not included """
+        # Revealed and flagged cells come in long runs and compress well
+        return (zlib.compress(self.revealed, 1), zlib.compress(self.flagged, 1),
+                self.revealed_count, self.flag_count, self.exploded,
+                frozenset(self.frontier))
+
+    def restore(self, state):
+        """ Go back to a snapshot() taken since the board was armed """
+        (revealed, flagged, self.revealed_count, self.flag_count, self.exploded,
+         frontier) = state
+        self.revealed = bytearray(zlib.decompress(revealed))
+        self.flagged = bytearray(zlib.decompress(flagged))
+        self.frontier = set(frontier)
+
+    def is_won(self):
+        """ True once every safe cell has been revealed """
+        return self.safe_remaining == 0
+
+    @property
+    def safe_remaining(self):
+        """ Number of safe cells still hidden """
+        return self.cells - self.mine_count - self.revealed_count
+
+    @property
+    def mines_remaining(self):
+        """ Mines left to find by the flag count, as the mine counter shows """
+        return self.mine_count - self.flag_count
+
+    @property
+    def game_id(self):
+        """ Short text that regenerates this board, e.g. 9x9-10-3f2a-4.4 """
+        text = f"{self.rows}x{self.cols}-{self.mine_count}-{self.seed:x}"
+        if self.first_click is not None:
+            text += "-{}.{}".format(*self.first_click)
+        return text
+
+    @classmethod
+    def from_game_id(cls, game_id):
+        """ Rebuild the board a game ID describes, armed if it has a click """
+        try:
+            parts = game_id.strip().split("-")
+            rows, cols = (int(n) for n in parts[0].split("x"))
+            board = cls(rows, cols, int(parts[1]), seed=int(parts[2], 16))
+            if len(parts) > 3:
+                x, y = (int(n) for n in parts[3].split("."))
+                board.arm(x, y)
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid game ID: {game_id!r}")
+        return board
+
+    def pack(self):
+        """ The mine layout as bytes: a header plus one bit per cell """
+        first = -1 if self.first_click is None else self.index(*self.first_click)
+        header = PACK_HEADER.pack(PACK_MAGIC, self.rows, self.cols,
+                                  self.mine_count, self.seed, first)
+
+        # Bit i of the little endian number is the mine flag of cell i
+        digits = bytes(self.mines).translate(TO_DIGITS)[::-1]
+        bits = int(digits, 2) if digits else 0
+        return header + bits.to_bytes((self.cells + 7) // 8, "little")
+
+    @classmethod
+    def unpack(cls, data):
+        """ Rebuild a board from the bytes made by pack(); it is armed only
+        if it was packed after its first click """
+        if len(data) < PACK_HEADER.size:
+            raise ValueError("Packed board is too short")
+        magic, rows, cols, mines, seed, first = PACK_HEADER.unpack_from(data)
+        if magic != PACK_MAGIC:
+            raise ValueError("Not a packed board")
+
+        board = cls(rows, cols, mines, seed=seed)
+        bits = int.from_bytes(data[PACK_HEADER.size:], "little")
+        digits = format(bits, f"0{board.cells}b")[::-1].encode()
+        board.mines = bytearray(digits.translate(FROM_DIGITS))
+        if len(board.mines) != board.cells or sum(board.mines) != mines:
+            raise ValueError("Packed board is corrupt")
+
+        board.count_mines()
+        board.prepared = True
+        if first >= 0:
+            board.first_click = board.coords(first)
+            board.is_armed = True
+        return board
@@ -0,0 +1,365 @@
+"""
+Endless Minesweeper board
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+An EndlessBoard has no edges. The plane is split into square chunks of
+CHUNK_SIZE x CHUNK_SIZE cells, and a chunk's mines are generated the first
+time anything needs them, from a random generator seeded with the board
+seed and the chunk's position - so a chunk always comes out the same, no
+matter in which order the player reaches it.
+
+Generated data - the mines, and the neighbour counts worked out from them
+and from the edges of the 8 chunks around - is kept in a ChunkStore, an
+LRU cache of at most `capacity` chunks. Chunks that have not been looked
+at for a while, which are the ones far from the view, are dropped and
+simply generated again when the player comes back. What the player did
+cannot be regenerated, so revealed cells and flags are kept separately in
+per-chunk Layers for every chunk the player has touched.
+
+Cells are addressed by (x, y) tuples; any integers are valid, negative
+ones included. The board answers the same questions as a Board - its
+index() is the (x, y) tuple itself and its layers are indexed by it - so
+the solver and the renderers work on it unchanged.
+"""
+from collections import OrderedDict
+from random import Random, SystemRandom
+
+# Cells per side of a chunk, a power of two so cells map to chunks by shifting
+CHUNK_SHIFT = 5
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Chunks of generated data kept in memory
+CHUNK_CAPACITY = 128
+
+# Mine density of a new endless game
+DEFAULT_DENSITY = 0.16
+
+# Below this density an empty region may never end: a cell is empty with
+# probability (1 - density) ** 9, and past about 0.4 empty cells join up
+# into one infinite region that a flood fill would follow forever
+MIN_DENSITY = 0.12
+
+
+def chunk_of(x, y):
+    """ (cx, cy) of the chunk holding cell (x, y) """
+    return x >> CHUNK_SHIFT, y >> CHUNK_SHIFT
+
+
+def offset_of(x, y):
+    """ Position of cell (x, y) inside its chunk's bytearrays """
+    return (x & CHUNK_MASK) << CHUNK_SHIFT | (y & CHUNK_MASK)
+
+
+class Chunk:
+    """ Generated data of one chunk: its mines and, once needed, their counts """
+
+    __slots__ = ("mines", "counts")
+
+    def __init__(self, mines):
+        """ mines has one byte per cell, row by row """
+        self.mines = mines
+        self.counts = None
+
+
+class ChunkStore:
+    """ Generates chunks on demand and keeps the most recently used ones """
+
+    def __init__(self, seed, density, capacity=CHUNK_CAPACITY):
+        """ Chunks are made from the seed and have about density mines per cell """
+        self.seed = seed
+        self.density = density
+        self.capacity = capacity
+        self.chunks = OrderedDict()
+
+        # Cells that are never mines: the 3x3 area of the first click
+        self.safe = frozenset()
+
+        self.generated = 0
+        self.evicted = 0
+
+    def set_safe(self, cells):
+        """ Keep mines off the given cells, dropping chunks made without that rule """
+        self.safe = frozenset(cells)
+        self.chunks.clear()
+
+    def chunk(self, cx, cy):
+        """ The chunk at (cx, cy), generated if it is not in the cache """
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(self.generate(cx, cy))
+            # Make room by dropping the least recently used chunks
+            while len(self.chunks) > self.capacity:
+                self.chunks.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def generate(self, cx, cy):
+        """ Mines of chunk (cx, cy), always the same for the same seed """
+        self.generated += 1
+        rng = Random(f"{self.seed}:{cx}:{cy}")
+        random = rng.random
+        density = self.density
+        mines = bytearray(random() < density for _ in range(CHUNK_SIZE * CHUNK_SIZE))
+
+        for x, y in self.safe:
+            if chunk_of(x, y) == (cx, cy):
+                mines[offset_of(x, y)] = 0
+        return mines
+
+    def counts(self, cx, cy):
+        """ Neighbour counts of chunk (cx, cy), worked out on first use """
+        chunk = self.chunk(cx, cy)
+        if chunk.counts is None:
+            chunk.counts = self.count_mines(cx, cy, chunk)
+        return chunk.counts
+
+    def count_mines(self, cx, cy, chunk):
+        """ Count the mines around every cell of a chunk, across its edges """
+        size = CHUNK_SIZE
+        width = size + 2
+
+        # Copy the chunk into a grid with a one cell border, and fill the
+        # border from the edges of the 8 chunks around it
+        grid = bytearray(width * width)
+        for dx in (-1, 0, 1):
+            rows = range(size) if dx == 0 else (size - 1,) if dx < 0 else (0,)
+            for dy in (-1, 0, 1):
+                mines = chunk.mines if dx == dy == 0 else self.chunk(cx + dx, cy + dy).mines
+                start, stop = (0, size) if dy == 0 else (size - 1, size) if dy < 0 else (0, 1)
+                column = start + 1 + dy * size
+                for r in rows:
+                    row = r + 1 + dx * size
+                    grid[row * width + column:row * width + column + stop - start] = \
+                        mines[r * size + start:r * size + stop]
+
+        # Sums of three cells across, then of three of those down
+        across = [[grid[row + c] + grid[row + c + 1] + grid[row + c + 2] for c in range(size)]
+                  for row in range(0, width * width, width)]
+        counts = bytearray(size * size)
+        mines = chunk.mines
+        for r in range(size):
+            above, middle, below = across[r], across[r + 1], across[r + 2]
+            base = r * size
+            for c in range(size):
+                counts[base + c] = above[c] + middle[c] + below[c] - mines[base + c]
+        return counts
+
+    def touch(self, top, bottom, left, right):
+        """ Mark the cached chunks covering rows top..bottom-1 and columns
+        left..right-1 as recently used, so the ones in view are kept """
+        chunks = self.chunks
+        for cx in range(top >> CHUNK_SHIFT, ((bottom - 1) >> CHUNK_SHIFT) + 1):
+            for cy in range(left >> CHUNK_SHIFT, ((right - 1) >> CHUNK_SHIFT) + 1):
+                if (cx, cy) in chunks:
+                    chunks.move_to_end((cx, cy))
+
+
+class Layer:
+    """ One byte of player state per cell, stored for touched chunks only """
+
+    def __init__(self):
+        """ Every cell starts at 0 """
+        self.chunks = {}
+
+    def __getitem__(self, cell):
+        """ The byte of cell (x, y) """
+        x, y = cell
+        chunk = self.chunks.get(chunk_of(x, y))
+        if chunk is None:
+            return 0
+        return chunk[offset_of(x, y)]
+
+    def __setitem__(self, cell, value):
+        """ Set the byte of cell (x, y) """
+        x, y = cell
+        key = chunk_of(x, y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        chunk[offset_of(x, y)] = value
+
+    def copy(self):
+        """ An independent copy of the layer """
+        layer = Layer()
+        layer.chunks = {key: bytearray(chunk) for key, chunk in self.chunks.items()}
+        return layer
+
+
+class GeneratedLayer:
+    """ Read-only view of the mines or counts of every cell, through the store """
+
+    def __init__(self, store, counts=False):
+        """ A view of the mines, or of the neighbour counts if counts is True """
+        self.store = store
+        self.counts = counts
+
+    def __getitem__(self, cell):
+        """ The byte of cell (x, y) """
+        x, y = cell
+        cx, cy = chunk_of(x, y)
+        if self.counts:
+            return self.store.counts(cx, cy)[offset_of(x, y)]
+        return self.store.chunk(cx, cy).mines[offset_of(x, y)]
+
+
+class EndlessBoard:
+    """ Game state for a board without edges """
+
+    # Never won, and has no fixed number of mines
+    mine_count = None
+
+    def __init__(self, density=DEFAULT_DENSITY, seed=None, capacity=CHUNK_CAPACITY):
+        """ Create an empty, unarmed board """
+        if not MIN_DENSITY <= density < 1:
+            raise ValueError(f"density must be at least {MIN_DENSITY} and below 1")
+        if seed is None:
+            seed = SystemRandom().getrandbits(48)
+        self.seed = seed
+        self.density = density
+        self.first_click = None
+
+        self.store = ChunkStore(seed, density, capacity)
+        self.mines = GeneratedLayer(self.store)
+        self.counts = GeneratedLayer(self.store, counts=True)
+        self.revealed = Layer()
+        self.flagged = Layer()
+
+        self.is_armed = False
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.exploded = None
+
+        # Hidden cells next to revealed ones, for the solver
+        self.frontier = set()
+
+    def index(self, x, y):
+        """ The key of the cell at (x, y), which is (x, y) itself """
+        return x, y
+
+    def coords(self, cell):
+        """ (x, y) of a cell key """
+        return cell
+
+    def neighbours(self, cell):
+        """ The 8 cells around a cell """
+        x, y = cell
+        return ((x - 1, y - 1), (x - 1, y), (x - 1, y + 1), (x, y - 1),
+                (x, y + 1), (x + 1, y - 1), (x + 1, y), (x + 1, y + 1))
+
+    def arm(self, x, y):
+        """ Keep the first click and the cells around it free of mines """
+        self.first_click = (x, y)
+        self.store.set_safe([(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+        self.is_armed = True
+
+    def reveal(self, x, y):
+        """ Reveal the cell at (x, y) and return the cells that changed """
+        cell = (x, y)
+        if self.revealed[cell] or self.flagged[cell]:
+            return []
+
+        self.revealed[cell] = 1
+        if self.mines[cell]:
+            self.exploded = cell
+            return [cell]
+
+        changed = [cell]
+        if self.counts[cell] == 0:
+            changed.extend(self._flood_fill(cell))
+        self.revealed_count += len(changed)
+        self._update_frontier(changed)
+        return changed
+
+    def _flood_fill(self, start):
+        """ Reveal the empty region around start, returns the cells revealed """
+        revealed, flagged, counts = self.revealed, self.flagged, self.counts
+        neighbours = self.neighbours
+        changed = []
+        stack = [start]
+        while stack:
+            for n in neighbours(stack.pop()):
+                if revealed[n] or flagged[n]:
+                    continue
+                revealed[n] = 1
+                changed.append(n)
+                if counts[n] == 0:
+                    stack.append(n)
+        return changed
+
+    def _update_frontier(self, changed):
+        """ Move newly revealed cells out of the frontier and add their neighbours """
+        frontier = self.frontier
+        frontier.difference_update(changed)
+        revealed, counts = self.revealed, self.counts
+        flags = self.flag_count
+        for c in changed:
+            if counts[c] or flags:
+                for n in self.neighbours(c):
+                    if not revealed[n]:
+                        frontier.add(n)
+
+    def toggle_flag(self, x, y):
+        """ Flag or unflag the cell at (x, y), returns False if revealed """
+        cell = (x, y)
+        if self.revealed[cell]:
+            return False
+
+        if self.flagged[cell]:
+            self.flagged[cell] = 0
+            self.flag_count -= 1
+        else:
+            self.flagged[cell] = 1
+            self.flag_count += 1
+        return True
+
+    def reset(self):
+        """ Hide every cell again but keep the mines where they are """
+        self.revealed = Layer()
+        self.flagged = Layer()
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.exploded = None
+        self.frontier = set()
+
+    def snapshot(self):
+        """ The player's progress so far, for restore() """
+        return (self.revealed.copy(), self.flagged.copy(), self.revealed_count,
+                self.flag_count, self.exploded, frozenset(self.frontier))
+
+    def restore(self, state):
+        """ Go back to a snapshot() taken since the board was armed """
+        revealed, flagged, self.revealed_count, self.flag_count, self.exploded, frontier = state
+        self.revealed = revealed.copy()
+        self.flagged = flagged.copy()
+        self.frontier = set(frontier)
+
+    def is_won(self):
+        """ An endless board can't be cleared """
+        return False
+
+    @property
+    def game_id(self):
+        """ Short text that regenerates this board, e.g. endless-0.16-3f2a-0.0 """
+        text = f"endless-{self.density:g}-{self.seed:x}"
+        if self.first_click is not None:
+            text += "-{}.{}".format(*self.first_click)
+        return text
+
+    @classmethod
+    def from_game_id(cls, game_id):
+        """ Rebuild the board a game ID describes, armed if it has a click """
+        try:
+            kind, density, seed, *click = game_id.strip().split("-", 3)
+            if kind != "endless":
+                raise ValueError
+            board = cls(float(density), seed=int(seed, 16))
+            if click:
+                x, _, y = click[0].rpartition(".")
+                board.arm(int(x), int(y))
+        except ValueError:
+            raise ValueError(f"Invalid game ID: {game_id!r}")
+        return board
@@ -0,0 +1,232 @@
+"""
+Board generation for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+BoardProducer keeps the next few boards for the current difficulty ready in
+a background thread, with their mines placed and counted, so a new game
+starts without any generation work. The first click then only has to
+move the few mines that landed around it.
+
+A no-guess board can be solved from its start cell by logic alone. Random
+candidate boards are played out by the solver from the start cell and
+only the ones it clears completely are kept. Candidates are checked in
+worker processes that are started once (with "spawn", as the game has
+threads running) and reused for every refill. Finished boards are kept in
+a small pool for each difficulty (as game IDs, saved in the user's cache
+folder) so a new no-guess game can start without waiting; while the pool
+is empty the game deals an ordinary board instead of waiting for one.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from random import SystemRandom
+import json
+import os
+import threading
+
+from board import Board
+from paths import cache_dir
+from solver import Solver
+
+
+def is_solvable(board, x, y):
+    """ True if the armed board can be cleared from (x, y) without guessing """
+    solver = Solver(board)
+    solver.update(board.reveal(x, y))
+    try:
+        while not board.is_won():
+            safe, mines = solver.solve()
+            if not safe:
+                # Once every mine is known, everything else is safe
+                if len(mines) < board.mine_count:
+                    return False
+                safe = [i for i in range(board.cells)
+                        if not board.revealed[i] and i not in mines]
+            for i in list(safe):
+                solver.update(board.reveal(*board.coords(i)))
+        return True
+    finally:
+        board.reset()
+
+
+def generate_no_guess(rows, cols, mines, start=None, seed=None, attempts=10000):
+    """ Find a no-guess board, returns it armed at its start cell or None """
+    x, y = start if start is not None else (rows // 2, cols // 2)
+    seeds = SystemRandom() if seed is None else None
+    for attempt in range(attempts):
+        board = Board(rows, cols, mines,
+                      seed=seeds.getrandbits(48) if seeds else seed + attempt)
+        board.arm(x, y)
+        if is_solvable(board, x, y):
+            return board
+    return None
+
+
+def generate_game_ids(rows, cols, mines, count):
+    """ Worker job: game IDs of count no-guess boards """
+    game_ids = []
+    while len(game_ids) < count:
+        board = generate_no_guess(rows, cols, mines)
+        if board is None:
+            break
+        game_ids.append(board.game_id)
+    return game_ids
+
+
+def generate_many(rows, cols, mines, count, executor=None, workers=1):
+    """ Game IDs of count no-guess boards, split across an executor's workers """
+    if executor is None or workers == 1 or count == 1:
+        return generate_game_ids(rows, cols, mines, count)
+
+    # Split the boards evenly between the workers
+    shares = [count // workers + (n < count % workers) for n in range(workers)]
+    jobs = [executor.submit(generate_game_ids, rows, cols, mines, share)
+            for share in shares if share]
+    return [game_id for job in jobs for game_id in job.result()]
+
+
+class NoGuessPool:
+    """ Ready-made no-guess boards for each difficulty """
+
+    def __init__(self, difficulties, target=5, path=None, workers=None):
+        """ difficulties is the game's table of {"size": ..., "mines": ...} """
+        self.difficulties = difficulties
+        self.target = target
+        self.path = path or os.path.join(cache_dir(), "no_guess_pool.json")
+        self.workers = workers or os.cpu_count() or 1
+        self.lock = threading.Lock()
+        self.filling = None
+        self.executor = None
+        self.boards = self.load()
+
+    def load(self):
+        """ Read the pool saved by an earlier session """
+        boards = {name: [] for name in self.difficulties}
+        try:
+            with open(self.path, "r") as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return boards
+
+        # Only keep boards that still match the difficulty settings
+        for name, settings in self.difficulties.items():
+            prefix = "{0}x{0}-{1}-".format(settings["size"], settings["mines"])
+            boards[name] = [game_id for game_id in saved.get(name, [])
+                            if game_id.startswith(prefix)]
+        return boards
+
+    def save(self):
+        """ Write the pool to disk for the next session """
+        with self.lock:
+            data = json.dumps(self.boards)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".tmp", "w") as file:
+                file.write(data)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError:
+            pass
+
+    def take(self, name):
+        """ An armed no-guess board for a difficulty, or None while none is ready """
+        with self.lock:
+            game_id = self.boards[name].pop() if self.boards.get(name) else None
+        self.refill()
+        if game_id is None:
+            return None
+        return Board.from_game_id(game_id)
+
+    def refill(self):
+        """ Top up every difficulty in a background thread """
+        if self.filling is not None and self.filling.is_alive():
+            return
+        self.filling = threading.Thread(target=self.fill, daemon=True)
+        self.filling.start()
+
+    def fill(self):
+        """ Generate boards until every difficulty has target of them """
+        for name, settings in self.difficulties.items():
+            with self.lock:
+                missing = self.target - len(self.boards.get(name, []))
+            if missing <= 0:
+                continue
+            game_ids = generate_many(settings["size"], settings["size"],
+                                     settings["mines"], missing,
+                                     self.start_workers(), self.workers)
+            with self.lock:
+                self.boards.setdefault(name, []).extend(game_ids)
+        self.save()
+
+    def start_workers(self):
+        """ The worker processes, started on the first refill and kept after """
+        if self.executor is None and self.workers > 1:
+            # Spawned, not forked: forking a process with threads running
+            # can leave a worker stuck on a lock another thread was holding
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=get_context("spawn"))
+        return self.executor
+
+    def close(self):
+        """ Stop the worker processes """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class BoardProducer:
+    """ Keeps boards with their mines placed ready in a background thread """
+
+    # Boards with more cells than this keep only one spare, to save memory
+    # and keep the background work from competing with the game
+    large_board = 250000
+
+    def __init__(self, depth=3):
+        """ depth is how many boards to keep ready """
+        self.depth = depth
+        self.boards = {}
+        self.wanted = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def take(self, rows, cols, mines):
+        """ A prepared board of the given size, made now if none is ready """
+        key = (rows, cols, mines)
+        with self.lock:
+            # Only boards of the size being played are worth keeping
+            ready = self.boards.get(key, [])
+            self.boards = {key: ready}
+            self.wanted = key
+            board = ready.pop() if ready else None
+
+        self.refill()
+        if board is None:
+            board = Board(rows, cols, mines)
+            board.prepare()
+        return board
+
+    def refill(self):
+        """ Wake the producer thread, starting it the first time """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.wake.set()
+
+    def run(self):
+        """ Producer loop: top up the wanted size, then wait for a take() """
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            while True:
+                with self.lock:
+                    key = self.wanted
+                    depth = 1 if key[0] * key[1] > self.large_board else self.depth
+                    if len(self.boards.get(key, [])) >= depth:
+                        break
+                board = Board(*key)
+                try:
+                    board.prepare()
+                except ValueError:
+                    break
+                with self.lock:
+                    if key == self.wanted:
+                        self.boards[key].append(board)
@@ -5,13 +5,23 @@ Developed by Muhammad Saeed (https://github.com/mid0o)
 from tkinter import *
 from tkinter import messagebox, ttk
 from random import randint
-from datetime import datetime
-import json
 import os
 import sys
 from PIL import Image, ImageTk
-import winsound
-import threading
+import multiprocessing
+from audio import SoundPlayer
+from endless import EndlessBoard
+from solver import Solver
+from stats import StatsStore
+from probability import mine_probabilities
+from generator import BoardProducer, NoGuessPool
+from profiling import Instrumentation
+from renderer import EndlessRenderer, TileRenderer, VirtualTileRenderer
+from replay import FLAG, REVEAL, Recorder
+from tiles import ModernTiles, TileFiles, tile_cache
+
+# Largest custom board, in rows and in columns
+CUSTOM_MAX_SIZE = 1000
 
 # Get correct path to resources
 def resource_path(relative_path):
@@ -51,9 +61,12 @@ class Minesweeper:
         
         # Enable sound by default
         self.sound_on = True
+        self.sound_player = SoundPlayer(self.sounds)
+        self.sound_player.preload()
         
-        # Store high scores
-        self.high_scores = self.load_high_scores()
+        # Every finished game is stored for the high scores and statistics;
+        # games a crash left unsaved are recovered here
+        self.stats = StatsStore()
 
         # Create the main window
         self.tk = tk
@@ -68,57 +81,41 @@ class Minesweeper:
             "hard": {"size": 20, "mines": 80}  # Reduced from 24x24 to 20x20
         }
         
+        # Custom boards set width, height and mines separately
+        self.custom = {"rows": 16, "cols": 30, "mines": 99}
+        
         # Default difficulty
         self.current_difficulty = "easy"
-        self.size = self.difficulties[self.current_difficulty]["size"]
+        self.rows = self.cols = self.difficulties[self.current_difficulty]["size"]
         self.selected_mines = self.difficulties[self.current_difficulty]["mines"]
         
+        # Boards for the next games are made in the background; no-guess
+        # mode deals boards that can be solved by logic alone
+        self.board_producer = BoardProducer()
+        self.no_guess = False
+        self.no_guess_pool = NoGuessPool(self.difficulties)
+        
+        # Every game's clicks are recorded so it can be replayed
+        self.recorder = None
+        
+        # Hidden performance counters, on with MINESWEEPER_PROFILE=1 or F12
+        self.instrumentation = Instrumentation(self.tk)
+        self.tk.bind("<F12>", lambda e: self.toggle_instrumentation())
+        
         # Check if we should use modern images
         self.use_modern_tiles = True  # True to use modern tiles, False for original
         
-        # Initialize image paths
-        self.tile_paths = {}
-        self.number_paths = []
-        
-        # Try to create modern tiles directory if it doesn't exist
-        try:
-            modern_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images/modern")
-            if not os.path.exists(modern_dir):
-                os.makedirs(modern_dir, exist_ok=True)
-                
-            # Store standard paths for classic images
-            self.classic_paths = {
-                "tile": resource_path("images/unclicked_tile.png"),
-                "mine": resource_path("images/unclicked_mine_tile.png"),
-                "flag": resource_path("images/flag_tile.png"),
-                "clicked_mine": resource_path("images/clicked_mine_tile.png"),
-                "wrong_flag": resource_path("images/wrong_flag_tile.png"),
-                "hint": resource_path("images/flag_tile.png")  # Reuse flag for hint in classic
-            }
-            self.classic_number_paths = [resource_path(f"images/num{i}_tile.png") for i in range(9)]
-            
-            # Create modern tiles if they don't exist
-            if not os.path.exists(os.path.join(modern_dir, "unclicked_tile.png")):
-                self.tile_paths, self.number_paths = create_modern_tiles()
-            else:
-                # Just set paths to existing modern tiles
-                self.tile_paths = {
-                    "tile": os.path.join(modern_dir, "unclicked_tile.png"),
-                    "mine": os.path.join(modern_dir, "unclicked_mine_tile.png"),
-                    "flag": os.path.join(modern_dir, "flag_tile.png"),
-                    "clicked_mine": os.path.join(modern_dir, "clicked_mine_tile.png"),
-                    "wrong_flag": os.path.join(modern_dir, "wrong_flag_tile.png"),
-                    "hint": os.path.join(modern_dir, "hint_tile.png")
-                }
-                self.number_paths = [os.path.join(modern_dir, f"num{i}_tile.png") for i in range(9)]
-                
-        except Exception as e:
-            print(f"Could not create modern tiles: {e}")
-            self.use_modern_tiles = False
-            
-            # Fallback to classic paths
-            self.tile_paths = self.classic_paths
-            self.number_paths = self.classic_number_paths
+        # Classic tiles ship with the game; modern ones are drawn on first
+        # use and kept as a single atlas image in the user's cache folder
+        self.classic_tiles = TileFiles({
+            "tile": resource_path("images/unclicked_tile.png"),
+            "mine": resource_path("images/unclicked_mine_tile.png"),
+            "flag": resource_path("images/flag_tile.png"),
+            "clicked_mine": resource_path("images/clicked_mine_tile.png"),
+            "wrong_flag": resource_path("images/wrong_flag_tile.png"),
+            "hint": resource_path("images/flag_tile.png")  # Reuse flag for hint in classic
+        }, [resource_path(f"images/num{i}_tile.png") for i in range(9)])
+        self.modern_tiles = ModernTiles()
         
         # Show the main menu first
         self.show_main_menu()
@@ -162,7 +159,7 @@ class Minesweeper:
         self.difficulty_var = StringVar(value=self.current_difficulty)
         
         # Difficulty radio buttons in a row
-        for diff in ["easy", "medium", "hard"]:
+        for diff in ["easy", "medium", "hard", "custom", "endless"]:
             diff_btn = Radiobutton(difficulty_frame, text=diff.capitalize(), 
                                   variable=self.difficulty_var, value=diff,
                                   command=self.set_difficulty,
@@ -172,9 +169,32 @@ class Minesweeper:
                                   activebackground=self.colors["bg"])
             diff_btn.pack(side=LEFT, padx=10)
         
+        # Custom board settings, used when "Custom" is selected
+        custom_frame = Frame(self.main_menu_frame, bg=self.colors["bg"])
+        custom_frame.pack(pady=(0, 10))
+        self.custom_vars = {}
+        for key, text in (("cols", "Width"), ("rows", "Height"), ("mines", "Mines")):
+            Label(custom_frame, text=text, font=("Arial", 10), bg=self.colors["bg"],
+                 fg=self.colors["fg"]).pack(side=LEFT, padx=(10, 4))
+            self.custom_vars[key] = StringVar(value=str(self.custom[key]))
+            Entry(custom_frame, textvariable=self.custom_vars[key], width=6,
+                 font=("Arial", 10), bg=self.colors["button_bg"], fg=self.colors["fg"],
+                 insertbackground=self.colors["fg"]).pack(side=LEFT)
+        
+        # No-guess mode toggle
+        self.no_guess_var = BooleanVar(value=self.no_guess)
+        no_guess_check = Checkbutton(self.main_menu_frame, text="No guessing needed",
+                                     variable=self.no_guess_var,
+                                     command=self.set_no_guess,
+                                     font=("Arial", 11), bg=self.colors["bg"],
+                                     fg=self.colors["fg"],
+                                     selectcolor=self.colors["button_bg"],
+                                     activebackground=self.colors["bg"])
+        no_guess_check.pack(pady=(0, 10))
+        
         # Game buttons
         play_button = Button(self.main_menu_frame, text="Play Game", 
-                            command=self.start_game, **button_style)
+                            command=self.play_from_menu, **button_style)
         play_button.pack(pady=10)
         
         scores_button = Button(self.main_menu_frame, text="High Scores", 
@@ -188,34 +208,42 @@ class Minesweeper:
     def set_difficulty(self):
         """ Set the game difficulty """
         self.current_difficulty = self.difficulty_var.get()
-        self.size = self.difficulties[self.current_difficulty]["size"]
-        self.selected_mines = self.difficulties[self.current_difficulty]["mines"]
+        if self.current_difficulty == "custom":
+            self.rows = self.custom["rows"]
+            self.cols = self.custom["cols"]
+            self.selected_mines = self.custom["mines"]
+        elif self.current_difficulty == "endless":
+            # Endless boards have no size or mine count to choose
+            pass
+        else:
+            self.rows = self.cols = self.difficulties[self.current_difficulty]["size"]
+            self.selected_mines = self.difficulties[self.current_difficulty]["mines"]
     
-    def load_high_scores(self):
-        """ Load high scores from file """
-        if os.path.exists("high_scores.json"):
+    def play_from_menu(self):
+        """ Check the custom settings if they are used, then start the game """
+        if self.current_difficulty == "custom":
             try:
-                with open("high_scores.json", "r") as file:
-                    return json.load(file)
-            except:
-                pass
-        return {"easy": [], "medium": [], "hard": []}
+                custom = {key: int(var.get()) for key, var in self.custom_vars.items()}
+            except ValueError:
+                messagebox.showerror("Custom Board", "Width, height and mines must be whole numbers.")
+                return
+            if not (1 <= custom["rows"] <= CUSTOM_MAX_SIZE and 1 <= custom["cols"] <= CUSTOM_MAX_SIZE):
+                messagebox.showerror("Custom Board", f"Width and height must be between 1 and {CUSTOM_MAX_SIZE}.")
+                return
+            if not 1 <= custom["mines"] < custom["rows"] * custom["cols"]:
+                messagebox.showerror("Custom Board", "There must be at least one mine and one free square.")
+                return
+            self.custom = custom
+            self.set_difficulty()
+        self.start_game()
+    
+    def set_no_guess(self):
+        """ Turn no-guess mode on or off """
+        self.no_guess = self.no_guess_var.get()
+        if self.no_guess:
+            # Get boards ready while the player is still in the menu
+            self.no_guess_pool.refill()
     
-    def save_high_score(self, time):
-        """ Save a new high score """
-        # Add the score to the list
-        self.high_scores[self.current_difficulty].append({"time": time, "date": datetime.now().strftime("%Y-%m-%d")})
-        
-        # Sort the list and keep top 5
-        self.high_scores[self.current_difficulty] = sorted(
-            self.high_scores[self.current_difficulty], 
-            key=lambda x: x["time"]
-        )[:5]
-        
-        # Save to file
-        with open("high_scores.json", "w") as file:
-            json.dump(self.high_scores, file)
-            
     def show_high_scores(self):
         """ Show the high scores screen """
         # Clear any existing frames
@@ -250,7 +278,8 @@ class Minesweeper:
             notebook.add(tab, text=diff.capitalize())
             
             # Create a list of high scores
-            if self.high_scores[diff]:
+            scores = self.stats.leaderboard(diff)
+            if scores:
                 # Table headers
                 Label(tab, text="Rank", font=("Arial", 12, "bold"), 
                      bg=self.colors["bg"], fg=self.colors["accent"], width=5).grid(row=0, column=0, padx=5, pady=5)
@@ -260,13 +289,20 @@ class Minesweeper:
                      bg=self.colors["bg"], fg=self.colors["accent"], width=15).grid(row=0, column=2, padx=5, pady=5)
                 
                 # Add scores
-                for i, score in enumerate(self.high_scores[diff]):
+                for i, score in enumerate(scores):
                     Label(tab, text=f"{i+1}", font=("Arial", 12), 
                          bg=self.colors["bg"], fg=self.colors["fg"]).grid(row=i+1, column=0, padx=5, pady=5)
                     Label(tab, text=f"{score['time']} sec", font=("Arial", 12), 
                          bg=self.colors["bg"], fg=self.colors["fg"]).grid(row=i+1, column=1, padx=5, pady=5)
                     Label(tab, text=f"{score['date']}", font=("Arial", 12), 
                          bg=self.colors["bg"], fg=self.colors["fg"]).grid(row=i+1, column=2, padx=5, pady=5)
+                
+                # Totals over every game played at this difficulty
+                played, won = self.stats.summary(diff)
+                median = self.stats.time_at(diff, 0.5)
+                Label(tab, text=f"Played {played} - Won {won} ({won * 100 // played}%) - Median {median} sec",
+                     font=("Arial", 10), bg=self.colors["bg"], fg=self.colors["fg"]).grid(
+                         row=len(scores)+1, column=0, columnspan=3, padx=5, pady=(10, 5))
             else:
                 Label(tab, text="No scores yet!", font=("Arial", 12), 
                      bg=self.colors["bg"], fg=self.colors["fg"], pady=20).pack()
@@ -312,41 +348,12 @@ class Minesweeper:
         self.mine_label = Label(mine_frame, text=f"Mines: {self.selected_mines}", bg=self.colors["button_bg"], fg=self.colors["fg"], font=("Arial", 10, "bold"))
         self.mine_label.pack(side=LEFT)
 
-        # Create game area (scrollable for hard difficulty)
+        # Create game area (the board renderer adds scrollbars for hard difficulty)
         game_container = Frame(main_container)
         game_container.pack(fill=BOTH, expand=True, padx=10, pady=10)
         
-        if self.current_difficulty == "hard":
-            # Create a canvas with scrollbars
-            canvas = Canvas(game_container, bg=self.colors["bg"])
-            
-            # Add vertical scrollbar
-            v_scrollbar = Scrollbar(game_container, orient=VERTICAL, command=canvas.yview)
-            v_scrollbar.pack(side=RIGHT, fill=Y)
-            canvas.configure(yscrollcommand=v_scrollbar.set)
-            
-            # Add horizontal scrollbar
-            h_scrollbar = Scrollbar(game_container, orient=HORIZONTAL, command=canvas.xview)
-            h_scrollbar.pack(side=BOTTOM, fill=X)
-            canvas.configure(xscrollcommand=h_scrollbar.set)
-            
-            # Pack the canvas
-            canvas.pack(side=LEFT, fill=BOTH, expand=True)
-            
-            # Create a frame inside the canvas for the game grid
-            self.frame = Frame(canvas, bg=self.colors["bg"])
-            
-            # Add the frame to the canvas
-            canvas.create_window((0, 0), window=self.frame, anchor="nw")
-            
-            # Configure the scroll region when the frame size changes
-            self.frame.bind("<Configure>", lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            ))
-        else:
-            # For easy and medium difficulty, use a simple frame
-            self.frame = Frame(game_container, bg=self.colors["bg"])
-            self.frame.pack(fill=BOTH, expand=True)
+        self.frame = Frame(game_container, bg=self.colors["bg"])
+        self.frame.pack(fill=BOTH, expand=True)
 
         # Create a label with the game over message (outside the scrollable area)
         self.message_label = Label(main_container, text="", font=("Arial", 14, "bold"), bg=self.colors["bg"], fg=self.colors["accent"])
@@ -457,87 +464,44 @@ class Minesweeper:
             btn.bind("<Enter>", lambda e, b=btn: self.button_hover_in(b))
             btn.bind("<Leave>", lambda e, b=btn: self.button_hover_out(b))
 
-        # Setup images
-        self.images = {
-            "tile": PhotoImage(file=resource_path("images/unclicked_tile.png")),
-            "mine": PhotoImage(file=resource_path("images/unclicked_mine_tile.png")),
-            "flag": PhotoImage(file=resource_path("images/flag_tile.png")),
-            "clicked_mine": PhotoImage(file=resource_path("images/clicked_mine_tile.png")),
-            "wrong_flag": PhotoImage(file=resource_path("images/wrong_flag_tile.png")),
-            "hint": PhotoImage(file=resource_path("images/flag_tile.png")),  # Reuse flag image for hint
-            "numbers": []
-        }
-        for i in range(0, 9):
-            self.images["numbers"].append(
-                PhotoImage(file=resource_path("images/num{}_tile.png".format(str(i))))
-            )
+        # Setup images (cached after the first game, so restarts don't read files)
+        self.load_game_images()
 
         self.start()
         
     def load_game_images(self):
         """ Load appropriate game images based on current style setting """
+        theme = "dark" if self.dark_mode else "light"
+        
+        # Use smaller tiles for hard difficulty and large custom boards
+        scale = 0.7 if self.scrolling() else 1
+        
         try:
             if self.use_modern_tiles:
-                # Use modern tiles from dynamically created images
-                self.images = {
-                    "tile": PhotoImage(file=self.tile_paths["tile"]),
-                    "mine": PhotoImage(file=self.tile_paths["mine"]),
-                    "flag": PhotoImage(file=self.tile_paths["flag"]),
-                    "clicked_mine": PhotoImage(file=self.tile_paths["clicked_mine"]),
-                    "wrong_flag": PhotoImage(file=self.tile_paths["wrong_flag"]),
-                    "hint": PhotoImage(file=self.tile_paths["hint"]),
-                    "numbers": []
-                }
-                for i in range(9):
-                    self.images["numbers"].append(
-                        PhotoImage(file=self.number_paths[i])
-                    )
+                # Use modern tiles from the generated atlas
+                self.images = tile_cache.get("modern", theme, scale, self.modern_tiles)
             else:
                 # Use classic (original) tiles
-                self.images = {
-                    "tile": PhotoImage(file=self.classic_paths["tile"]),
-                    "mine": PhotoImage(file=self.classic_paths["mine"]),
-                    "flag": PhotoImage(file=self.classic_paths["flag"]),
-                    "clicked_mine": PhotoImage(file=self.classic_paths["clicked_mine"]),
-                    "wrong_flag": PhotoImage(file=self.classic_paths["wrong_flag"]),
-                    "hint": PhotoImage(file=self.classic_paths["hint"]),
-                    "numbers": []
-                }
-                for i in range(9):
-                    self.images["numbers"].append(
-                        PhotoImage(file=self.classic_number_paths[i])
-                    )
+                self.images = tile_cache.get("classic", theme, scale, self.classic_tiles)
         except Exception as e:
             # Fallback to classic images if anything fails
             print(f"Error loading images: {e}")
             self.use_modern_tiles = False
-            
-            # Last resort fallback using resource_path directly
-            self.images = {
-                "tile": PhotoImage(file=resource_path("images/unclicked_tile.png")),
-                "mine": PhotoImage(file=resource_path("images/unclicked_mine_tile.png")),
-                "flag": PhotoImage(file=resource_path("images/flag_tile.png")),
-                "clicked_mine": PhotoImage(file=resource_path("images/clicked_mine_tile.png")),
-                "wrong_flag": PhotoImage(file=resource_path("images/wrong_flag_tile.png")),
-                "hint": PhotoImage(file=resource_path("images/flag_tile.png")),  # Reuse flag image for hint
-                "numbers": []
-            }
-            for i in range(9):
-                self.images["numbers"].append(
-                    PhotoImage(file=resource_path(f"images/num{i}_tile.png"))
-                )
+            self.images = tile_cache.get("classic", theme, scale, self.classic_tiles)
 
     def toggle_tile_style(self):
         """ Toggle between modern and classic tile styles """
         self.use_modern_tiles = not self.use_modern_tiles
         style_text = "Modern" if self.use_modern_tiles else "Classic"
         
+        # Restart the game with the new style
+        self.load_game_images()
+        self.renderer.images = self.images
+        self.restart()
+        
         # Update the message to inform the user
         self.message_label.config(text=f"Switched to {style_text} Tile Style")
         self.tk.after(1500, lambda: self.message_label.config(text=""))
-        
-        # Restart the game to apply the new style
-        self.restart()
 
     def button_hover_in(self, button):
         """ Add hover effect to button """
@@ -579,6 +543,7 @@ class Minesweeper:
         # Update all colors
         self.tk.configure(bg=self.colors["bg"])
         self.frame.configure(bg=self.colors["bg"])
+        self.renderer.canvas.configure(bg=self.colors["bg"])
         self.message_label.configure(bg=self.colors["bg"], fg=self.colors["accent"])
         
         # Update all controls
@@ -605,6 +570,14 @@ class Minesweeper:
             self.message_label.config(text="Sound disabled")
         self.tk.after(1500, lambda: self.message_label.config(text=""))
     
+    def toggle_instrumentation(self):
+        """ Turn the hidden performance counters on or off """
+        enabled = self.instrumentation.toggle()
+        message_label = getattr(self, "message_label", None)
+        if message_label is not None and message_label.winfo_exists():
+            message_label.config(text="Performance counters " + ("on" if enabled else "off"))
+            self.tk.after(1500, lambda: message_label.config(text=""))
+    
     def show_help(self):
         """ Display game help """
         help_window = Toplevel(self.tk)
@@ -616,7 +589,7 @@ class Minesweeper:
         
         # Center the window
         w = 400
-        h = 350
+        h = 430
         ws = self.tk.winfo_screenwidth()
         hs = self.tk.winfo_screenheight()
         x = (ws/2) - (w/2)
@@ -643,6 +616,9 @@ class Minesweeper:
             "- 🏠 Menu: return to the main menu",
             "- 🌓 Theme: toggle between dark and light mode",
             "- 🔊 Sound: toggle game sounds on/off",
+            "- No guessing needed (menu): boards solvable by logic alone",
+            f"- Custom (menu): any width, height and mine count up to {CUSTOM_MAX_SIZE}x{CUSTOM_MAX_SIZE}",
+            "- Endless (menu): a board without edges - explore as far as you can",
             "",
             "Developed by: Muhammad Saeed"
         ]
@@ -658,127 +634,108 @@ class Minesweeper:
 
     def start(self):
         """ Start the game """
+        # Add padding between tiles based on difficulty
+        padding = 1 if self.current_difficulty == "easy" else 0
+        
+        # Create a centered container for the grid
+        grid_container = Frame(self.frame, bg=self.colors["bg"], padx=20, pady=20)
+        grid_container.pack(expand=True, fill=BOTH)
+        
+        # Draw the board on a single canvas; hard mode and large boards
+        # scroll, so only the tiles in view are drawn there, and endless
+        # boards stream in the tiles around the view as it moves
+        self.board = self.next_board()
+        if self.current_difficulty == "endless":
+            self.renderer = EndlessRenderer(grid_container, self.board, self.images,
+                                            padding=padding, bg=self.colors["bg"])
+            self.renderer.pack(fill=BOTH, expand=True)
+        elif self.scrolling():
+            self.renderer = VirtualTileRenderer(grid_container, self.board, self.images,
+                                                padding=padding, bg=self.colors["bg"])
+            self.renderer.pack(fill=BOTH, expand=True)
+        else:
+            self.renderer = TileRenderer(grid_container, self.board, self.images,
+                                         padding=padding, bg=self.colors["bg"])
+            self.renderer.pack()
+        self.renderer.bind(self.left_click, self.right_click)
+        self.tk.bind("r", lambda Res: self.restart())
+        
+        self.new_game()
+
+    def scrolling(self):
+        """ True if the board is too big to show whole and has to scroll """
+        return self.current_difficulty in ("hard", "endless") or max(self.rows, self.cols) > 20
+
+    def next_board(self):
+        """ The board for the next game, ready to play """
+        # No-guess boards come with their mines already placed; other
+        # boards are prepared ahead of time and armed on the first click.
+        # Only the standard difficulties have no-guess boards, and while
+        # the pool is still empty the game gets an ordinary board.
+        if self.current_difficulty == "endless":
+            return EndlessBoard()
+        if self.no_guess and self.current_difficulty in self.difficulties:
+            board = self.no_guess_pool.take(self.current_difficulty)
+            if board is not None:
+                return board
+        return self.board_producer.take(self.rows, self.cols, self.selected_mines)
+
+    def new_game(self):
+        """ Reset the counters, timer and messages for the current board """
         # Setting our variables
-        self.is_armed = False
-        self.clicks = 0
-        self.flags = 0
         self.stop = False
-        self.reloaded = False
+        self.timer_running = False
+        self.start_marker = None
         self.repeat_timer = "after#0"
-        
-        # Track the last time a sound was played to limit multiple sounds
-        self.last_sound_time = 0
-        self.sound_cooldown = 0.1  # seconds between sounds
+        self.solver = Solver(self.board)
+        self.clicks = 0
+        self.start_recording()
 
         # Setup time
         self.time = 0
         self.time_label.config(text="Time: 0")
+        self.time_progress.delete("all")
 
-        # Setup mine counter
-        self.mine_label.config(text=f"Mines: {self.selected_mines - self.flags}")
+        # Setup mine counter and hints
+        self.mine_label.config(text=self.mine_counter())
+        self.hints_remaining = 3
+        self.hint_btn.config(text=f" 💡 Hint ({self.hints_remaining})", state=NORMAL)
                                
-        # Welcome message with scrolling instructions for hard difficulty
-        if self.current_difficulty == "hard":
+        # Welcome message with scrolling instructions for large grids
+        if self.current_difficulty == "endless":
+            self.message_label.config(text="Endless mode - Drag with the middle button or use the arrow keys to explore")
+            self.tk.after(4000, lambda: self.message_label.config(text=""))
+        elif self.current_difficulty == "hard":
             self.message_label.config(text="Hard mode - Use scrollbars to navigate the larger grid")
             self.tk.after(4000, lambda: self.message_label.config(text=""))
+        elif self.scrolling():
+            self.message_label.config(text=f"{self.rows}x{self.cols} board - Use scrollbars to navigate the grid")
+            self.tk.after(4000, lambda: self.message_label.config(text=""))
         else:
             self.message_label.config(text=f"Welcome to Minesweeper ({self.current_difficulty.capitalize()})")
             self.tk.after(3000, lambda: self.message_label.config(text=""))
-
-        # Create the grid
-        self.grid = {}
-        
-        # Adjust tile size based on difficulty to ensure buttons are visible
-        if self.current_difficulty == "hard":
-            # Use smaller tiles for hard difficulty
-            for img_name, img in self.images.items():
-                if img_name == "numbers":
-                    # Handle the numbers list separately
-                    for i in range(len(self.images["numbers"])):
-                        # Create a smaller version of each number image
-                        img = self.images["numbers"][i]
-                        self.images["numbers"][i] = self.resize_image(img, 0.7)
-                else:
-                    # Resize other images
-                    self.images[img_name] = self.resize_image(img, 0.7)
-        
-        # Add padding between tiles based on difficulty
-        padding = 1 if self.current_difficulty == "easy" else 0
-        
-        # Create a centered container for the grid
-        grid_container = Frame(self.frame, bg=self.colors["bg"], padx=20, pady=20)
-        grid_container.pack(expand=True, fill=BOTH)
-        
-        # Use the grid layout manager to position tiles
-        for i in range(self.size):
-            grid_container.grid_columnconfigure(i, weight=1, uniform="col")
-            grid_container.grid_rowconfigure(i, weight=1, uniform="row")
         
-        # Create the grid of tiles
-        for x in range(0, self.size):
-            for y in range(0, self.size):
-                if y == 0:
-                    self.grid[x] = {}
-                
-                tile = {
-                    "button": Button(grid_container,
-                                     image=self.images["tile"],
-                                     borderwidth=0,
-                                     highlightthickness=0),
-                    "is_mine": False,
-                    "surrounding_mines": 0,
-                    "is_flagged": False,
-                    "is_clicked": False,
-                    "first": False,
-                    "x": x,
-                    "y": y
-                }
-                tile["button"].bind("<Button-1>",
-                                    lambda Button, x=x, y=y:
-                                    self.left_click(x, y))
-                tile["button"].bind("<Button-3>",
-                                    lambda Button, x=x, y=y:
-                                    self.right_click(x, y))
-                
-                # Place tiles in a grid with equal spacing
-                tile["button"].grid(row=x, column=y, padx=padding, pady=padding, sticky="nsew")
-                
-                self.tk.bind("r", lambda Res: self.restart())
-                self.grid[x][y] = tile
-        
-        # After creating all tiles, update the parent frame
-        self.frame.update_idletasks()
-        
-        # For hard mode, update the canvas to show the centered content
-        if self.current_difficulty == "hard":
-            # Get the canvas from the frame's master
-            canvas = self.frame.master
-            
-            # Update the canvas to reflect changes
-            canvas.update_idletasks()
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        # Mark where a no-guess board has to be started from
+        if self.board.is_armed:
+            self.show_start_marker()
+            self.message_label.config(text="No guessing needed - start from the marked square")
 
-    def resize_image(self, img, scale_factor):
-        """ Resize an image by a scale factor """
-        if not hasattr(img, 'width') or not hasattr(img, 'height'):
-            return img
-            
-        # Get the original width and height
-        width = img.width()
-        height = img.height()
-        
-        # Calculate new dimensions
-        new_width = int(width * scale_factor)
-        new_height = int(height * scale_factor)
-        
-        # Create a temporary image with the new dimensions
-        temp_img = PhotoImage(width=new_width, height=new_height)
-        
-        # Scale the original image into the temporary image
-        img.zoom(new_width, new_height)
-        img.subsample(width, height)
-        
-        return img
+    def start_recording(self):
+        """ Record the clicks of the game that is starting, for replays """
+        if self.recorder is not None:
+            self.recorder.close()
+        self.recorder = Recorder(self.board.game_id)
+
+    def mine_counter(self):
+        """ Text of the mine counter; endless boards count flags instead """
+        if self.board.mine_count is None:
+            return f"Flags: {self.board.flag_count}"
+        return f"Mines: {self.board.mines_remaining}"
+
+    def show_start_marker(self):
+        """ Outline the start square of a no-guess board """
+        start = self.board.index(*self.board.first_click)
+        self.start_marker = self.renderer.highlight(start, self.colors["success"])
 
     def restart(self):
         """ Restart the game """
@@ -789,240 +746,102 @@ class Minesweeper:
             self.game_over_window.destroy()
         except Exception:
             pass
-        self.start_game()
-
-    def create_mine(self):
-        """ Create mines """
-        for x in self.grid:
-            for y in self.grid[x]:
-                # Check the place where the lpayer first click to avoid mines
-                if self.grid[x][y]["first"] is True:
-                    continue
-
-                # If the mine already exists, continue
-                if self.grid[x][y]["is_mine"] is True:
-                    continue
-
-                # Distributes the mines with max efficiency
-                if randint(0, (self.size ** 2 + 1) //
-                           (self.selected_mines) + 1) == 0:
-                    self.grid[x][y]["is_mine"] = True
-                    # self.grid[x][y]["button"].config(
-                    # image=self.images["mine"])
-                    self.mines += 1
-
-                # If the amount of mines is met, return
-                if self.mines == self.selected_mines:
-                    return
-
-    def check_mines(self):
-        """ Check surrounding mines """
-        for x in self.grid:
-            for y in self.grid[x]:
-
-                # If it was mine continue
-                if self.grid[x][y]["is_mine"] is True:
-                    continue
-
-                # Check surrounding mines
-                for i in range(-1, 2):
-                    for j in range(-1, 2):
-                        # if out of boundries top and side
-                        if x + i < 0 or y + j < 0:
-                            continue
-
-                        # if out of boundries bot and side
-                        if x + i > self.size - 1 or y + j > self.size - 1:
-                            continue
-
-                        if self.grid[x + i][y + j]["is_mine"] is True:
-                            self.grid[x][y]["surrounding_mines"] += 1
-                # self.grid[x][y]["button"].config(
-                    # image=self.images["numbers"]
-                    # [self.grid[x][y]["surrounding_mines"]])
+        
+        # Deal a ready-made board into the existing window
+        self.board = self.next_board()
+        self.renderer.set_board(self.board)
+        self.new_game()
 
     def play_sound(self, sound_type):
         """ Play a sound effect """
         if not self.sound_on:
             return
-            
-        # Check if we're in a multi-tile clearing operation
-        current_time = datetime.now().timestamp()
-        time_since_last = current_time - self.last_sound_time
         
-        # If sound is triggered by clearing multiple cells and cooldown hasn't expired, skip
-        if sound_type == "click" and time_since_last < self.sound_cooldown:
-            return
-            
-        # Update the last sound time
-        self.last_sound_time = current_time
-            
-        # Play sound in a separate thread to avoid freezing the UI
-        def play():
-            frequency = self.sounds[sound_type]
-            duration = 150  # milliseconds
-            
-            # Reduce click sound volume for multiple clears by reducing duration
-            if sound_type == "click" and time_since_last < 0.5:
-                duration = 50  # Shorter duration for rapid clicks
-            
-            if sound_type == "win":
-                # Play victory melody
-                for freq in [frequency, frequency+200, frequency+400]:
-                    winsound.Beep(freq, 150)
-            elif sound_type == "lose":
-                # Play failure sound
-                winsound.Beep(frequency, 500)
-            else:
-                # Play normal sound
-                winsound.Beep(frequency, duration)
-                
-        threading.Thread(target=play).start()
+        # Starts at once without waiting for the UI; it is mixed with the
+        # sounds still playing, and past MAX_VOICES the oldest is cut off
+        self.sound_player.play(sound_type)
 
     def left_click(self, x, y):
         """ Left click """
         if self.stop:
             return
-        if self.is_armed is False:
-            # Create mines in the grid
-            self.mines = 0
-            for i in range(-1, 2):
-                for j in range(-1, 2):
-                    # if out of boundries top and side
-                    if x + i < 0 or y + j < 0:
-                        continue
+        self.recorder.record(REVEAL, x, y)
+        self.clicks += 1
+        if self.board.is_armed is False:
+            # Create mines in the grid, away from the first click
+            self.board.arm(x, y)
 
-                    # if out of boundries bot and side
-                    if x + i > self.size - 1 or y + j > self.size - 1:
-                        continue
-
-                    self.grid[x + i][y + j]["first"] = True
-            while True:
-                # forever loop until the number is met
-                self.create_mine()
-                if self.mines == self.selected_mines:
-                    break
-            self.is_armed = True
+        # Start the clock on the first click, and again after a reload
+        if self.timer_running is False:
+            self.timer_running = True
             self.timer()
+            if self.start_marker is not None:
+                self.renderer.canvas.delete(self.start_marker)
+                self.start_marker = None
 
-            # Check surrounding mines
-            self.check_mines()
-
-        if self.reloaded is True:
-            self.reloaded = False
-            self.timer()
-        if self.grid[x][y]["is_flagged"] is True:
+        # Flagged or already revealed tiles don't change
+        changed = self.board.reveal(x, y)
+        if not changed:
             return
 
-        if self.grid[x][y]["is_clicked"] is True:
-            return
+        # Show every tile the click opened, including a whole empty region
+        self.renderer.refresh(changed)
+        self.solver.update(changed)
 
-        elif self.grid[x][y]["is_mine"] is True:
-            self.grid[x][y]["button"].config(
-                image=self.images["clicked_mine"])
-            self.grid[x][y]["is_clicked"] = True
+        if self.board.exploded is not None:
             self.play_sound("lose")
             self.game_over(False)
+            return
 
-        elif self.grid[x][y]["surrounding_mines"] == 0:
-            self.grid[x][y]["button"].config(
-                image=self.images["numbers"][0])
-            self.grid[x][y]["is_clicked"] = True
-            self.play_sound("click")
-            self.clicks += 1
-            if self.clicks == (self.size ** 2 - self.mines):
-                self.play_sound("win")
-                self.game_over(True)
-            else:
-                self.clear_surr(x, y)
-
-        else:
-            self.grid[x][y]["button"].config(
-                image=self.images["numbers"]
-                [self.grid[x][y]["surrounding_mines"]])
-            self.grid[x][y]["is_clicked"] = True
-            self.play_sound("click")
-            self.clicks += 1
-            if self.clicks == (self.size ** 2 - self.mines):
-                self.play_sound("win")
-                self.game_over(True)
-
-    def clear_surr(self, x, y):
-        """ Clear surrounding tiles """
-        # Create a list of surrounding tiles to check
-        tiles_to_check = []
-        
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                # If out of boundaries top and side
-                if x + i < 0 or y + j < 0:
-                    continue
-
-                # If out of boundaries bottom and side
-                if x + i > self.size - 1 or y + j > self.size - 1:
-                    continue
-                
-                # Add to list to check
-                tiles_to_check.append((x + i, y + j))
-        
-        # Use a timer to stagger the opening of surrounding tiles
-        # This makes the clearing animation smoother and reduces sound overload
-        def open_tile_staggered(index):
-            if index < len(tiles_to_check):
-                tx, ty = tiles_to_check[index]
-                self.left_click(tx, ty)
-                # Schedule next tile opening with a small delay
-                self.tk.after(5, lambda: open_tile_staggered(index + 1))
-        
-        # Start the staggered opening
-        open_tile_staggered(0)
+        self.play_sound("click")
+        if self.board.is_won():
+            self.play_sound("win")
+            self.game_over(True)
 
     def right_click(self, x, y):
         """ Right click """
         if self.stop:
             return
+        self.recorder.record(FLAG, x, y)
+        self.clicks += 1
 
-        if self.grid[x][y]["is_clicked"] is True:
+        if not self.board.toggle_flag(x, y):
             return
 
-        if self.grid[x][y]["is_flagged"] is False:
-            # Change to flagged
-            self.grid[x][y]["button"].config(image=self.images["flag"])
-            self.grid[x][y]["is_flagged"] = True
-            self.flags += 1
-            self.play_sound("flag")
-        else:
-            # Change to unflagged
-            self.grid[x][y]["button"].config(image=self.images["tile"])
-            self.grid[x][y]["is_flagged"] = False
-            self.flags -= 1
-            self.play_sound("flag")
+        # Draw the flag, or the plain tile again when unflagged
+        self.renderer.refresh([self.board.index(x, y)])
+        self.play_sound("flag")
 
         # Update mines left
-        self.mine_label.config(text=f"Mines: {self.selected_mines - self.flags}")
+        self.mine_label.config(text=self.mine_counter())
 
     def game_over(self, result):
         """ Game over screen """
         self.stop = True
         self.tk.after_cancel(self.repeat_timer)
+        self.recorder.close()
+        
+        # A win is a high score if it makes the top 5 (custom boards have no table)
+        standard = self.current_difficulty in self.difficulties
+        is_high_score = result and standard and self.stats.rank(self.current_difficulty, self.time) < 5
+        
+        # Store every game, won or lost; the disk is written in the background
+        # but the game counts in the statistics straight away
+        self.stats.record(self.current_difficulty, result, self.time, clicks=self.clicks,
+                          hints=3 - self.hints_remaining, revealed=self.board.revealed_count,
+                          game_id=self.board.game_id)
         
         # Handle high score if player wins
         if result:
-            # Check if this is a high score
-            is_high_score = False
-            if len(self.high_scores[self.current_difficulty]) < 5:
-                is_high_score = True
-            elif self.time < max([score["time"] for score in self.high_scores[self.current_difficulty]], default=999999):
-                is_high_score = True
-                
-            # Save high score
             if is_high_score:
-                self.save_high_score(self.time)
                 winner_text = f"You Win! New High Score: {self.time}s"
                 message_color = self.colors["success"]
             else:
                 winner_text = f"You Win! Time: {self.time}s"
                 message_color = self.colors["accent"]
+        elif self.board.mine_count is None:
+            winner_text = f"Game Over! {self.board.revealed_count} squares uncovered"
+            message_color = self.colors["error"]
         else:
             winner_text = "Game Over!"
             message_color = self.colors["error"]
@@ -1030,16 +849,8 @@ class Minesweeper:
         # Update message label
         self.message_label.config(text=winner_text, fg=message_color)
         
-        # Show all mines
-        for x in self.grid:
-            for y in self.grid[x]:
-                if not self.grid[x][y]["is_clicked"]:
-                    if self.grid[x][y]["is_mine"] and not self.grid[x][y]["is_flagged"]:
-                        self.grid[x][y]["button"].config(
-                            image=self.images["mine"])
-                    elif not self.grid[x][y]["is_mine"] and self.grid[x][y]["is_flagged"]:
-                        self.grid[x][y]["button"].config(
-                            image=self.images["wrong_flag"])
+        # Show all mines and wrongly placed flags
+        self.renderer.reveal_mines()
 
         # Show game over popup
         self.game_over_window = Toplevel(self.tk)
@@ -1051,7 +862,7 @@ class Minesweeper:
         
         # Center the window
         w = 300
-        h = 200
+        h = 225
         ws = self.tk.winfo_screenwidth()
         hs = self.tk.winfo_screenheight()
         x = (ws/2) - (w/2)
@@ -1074,6 +885,12 @@ class Minesweeper:
              font=("Arial", 12), bg=self.colors["bg"], fg=self.colors["fg"]).pack()
         Label(stats_frame, text=f"Time: {self.time} seconds", 
              font=("Arial", 12), bg=self.colors["bg"], fg=self.colors["fg"]).pack()
+        # This win is already counted, even before it reaches the disk, so
+        # it is compared with the earlier wins only if there are any
+        if result and standard and self.stats.wins(self.current_difficulty) > 1:
+            faster = self.stats.percentile(self.current_difficulty, self.time)
+            Label(stats_frame, text=f"Faster than {faster:.0f}% of your wins", 
+                 font=("Arial", 12), bg=self.colors["bg"], fg=self.colors["fg"]).pack()
         
         # Buttons frame
         button_frame = Frame(self.game_over_window, bg=self.colors["bg"], pady=20)
@@ -1091,23 +908,22 @@ class Minesweeper:
 
     def reload(self):
         """ Reload the same game """
-        self.reloaded = True
+        self.timer_running = False
         self.time_label.config(text="Time: 0")
         self.stop = True
         self.tk.after_cancel(self.repeat_timer)
         self.message_label.config(text="")
         
-        # Reset flags counter
-        self.flags = 0
-        self.mine_label.config(text=f"Mines: {self.selected_mines}")
-        
-        # Reset the grid but maintain mines
-        for x in self.grid:
-            for y in self.grid[x]:
-                # Put the unclicked tile back
-                self.grid[x][y]["button"].config(image=self.images["tile"])
-                self.grid[x][y]["is_clicked"] = False
-                self.grid[x][y]["is_flagged"] = False
+        # Reset the grid but maintain mines, then the flags counter
+        self.board.reset()
+        self.mine_label.config(text=self.mine_counter())
+        self.solver.reset()
+        self.clicks = 0
+        self.start_recording()
+        self.renderer.game_over = False
+        self.renderer.refresh_all()
+        if self.no_guess and self.board.is_armed and self.start_marker is None:
+            self.show_start_marker()
         
         # Reset time
         self.time = 0
@@ -1146,66 +962,81 @@ class Minesweeper:
             self.tk.after(1500, lambda: self.message_label.config(text=""))
             return
             
-        # Find a safe tile to reveal
-        safe_tiles = []
-        for x in self.grid:
-            for y in self.grid[x]:
-                # Look for unclicked, unflagged, non-mine tiles
-                if (not self.grid[x][y]["is_clicked"] and 
-                    not self.grid[x][y]["is_flagged"] and 
-                    not self.grid[x][y]["is_mine"]):
-                    safe_tiles.append((x, y))
-        
-        # Find an unflagged mine
-        unflagged_mines = []
-        for x in self.grid:
-            for y in self.grid[x]:
-                if (self.grid[x][y]["is_mine"] and 
-                    not self.grid[x][y]["is_flagged"] and
-                    not self.grid[x][y]["is_clicked"]):
-                    unflagged_mines.append((x, y))
-        
-        if safe_tiles and self.is_armed:
+        if not self.board.is_armed:
+            self.message_label.config(text="Start the game first!", fg=self.colors["accent"])
+            self.tk.after(1500, lambda: self.message_label.config(text=""))
+            return
+            
+        # Deduce safe tiles and mines from the numbers on the board, the
+        # same way a player would, instead of peeking at the mines
+        safe, mines = self.solver.solve()
+        safe_tiles = sorted(i for i in safe if not self.board.flagged[i])
+        unflagged_mines = sorted(i for i in mines if not self.board.flagged[i])
+        
+        if safe_tiles or unflagged_mines:
             # Play the hint sound
             self.play_sound("hint")
             
             # Randomly choose whether to reveal a safe tile or hint at a mine
-            if unflagged_mines and randint(0, 2) == 0:
+            if unflagged_mines and (not safe_tiles or randint(0, 2) == 0):
                 # Hint at a mine location
-                x, y = unflagged_mines[randint(0, len(unflagged_mines)-1)]
+                i = unflagged_mines[randint(0, len(unflagged_mines)-1)]
                 
-                # Temporarily change the button appearance
-                original_image = self.grid[x][y]["button"].cget("image")
-                self.grid[x][y]["button"].config(image=self.images["hint"])
+                # Temporarily change the tile appearance
+                self.renderer.show_image(i, self.images["hint"])
                 
                 # Show hint message
                 self.message_label.config(text="Hint: There is a mine in the revealed square!", fg=self.colors["accent"])
                 
                 # Reset after 1.5 seconds
                 self.tk.after(1500, lambda: [
-                    self.grid[x][y]["button"].config(image=original_image),
+                    self.renderer.refresh([i]),
                     self.message_label.config(text="")
                 ])
             else:
                 # Reveal a safe tile
-                x, y = safe_tiles[randint(0, len(safe_tiles)-1)]
+                i = safe_tiles[randint(0, len(safe_tiles)-1)]
                 
                 # Highlight the safe tile
-                original_image = self.grid[x][y]["button"].cget("image")
-                self.grid[x][y]["button"].config(bg=self.colors["success"])
+                highlight = self.renderer.highlight(i, self.colors["success"])
                 
                 # Show hint message
                 self.message_label.config(text="Hint: The revealed square is safe!", fg=self.colors["success"])
                 
                 # Reset after 1.5 seconds
                 self.tk.after(1500, lambda: [
-                    self.grid[x][y]["button"].config(bg=self.colors["bg"]),
+                    self.renderer.canvas.delete(highlight),
                     self.message_label.config(text="")
                 ])
-        else:
-            self.message_label.config(text="Start the game first!", fg=self.colors["accent"])
+        elif self.board.mine_count is None:
+            # Without a mine total there are no odds to work out
+            self.message_label.config(text="No certain move - you'll have to guess!", fg=self.colors["accent"])
             self.tk.after(1500, lambda: self.message_label.config(text=""))
             return
+        else:
+            # Nothing is certain: shade every hidden square by how likely
+            # it is to be a mine and point at the safest guess
+            probabilities = mine_probabilities(self.solver)
+            i = probabilities.safest()
+            if i is None:
+                self.message_label.config(text="No certain move - you'll have to guess!", fg=self.colors["accent"])
+                self.tk.after(1500, lambda: self.message_label.config(text=""))
+                return
+            
+            self.play_sound("hint")
+            self.renderer.show_heat_map(probabilities)
+            highlight = self.renderer.highlight(i, self.colors["accent"])
+            
+            # Show hint message
+            risk = round(probabilities[i] * 100)
+            self.message_label.config(text=f"Hint: No sure move - safest guess is marked ({risk}% risk)", fg=self.colors["accent"])
+            
+            # Reset after 3 seconds
+            self.tk.after(3000, lambda: [
+                self.renderer.clear_heat_map(),
+                self.renderer.canvas.delete(highlight),
+                self.message_label.config(text="")
+            ])
             
         # Decrement hint count and update button
         self.hints_remaining -= 1
@@ -1224,9 +1055,12 @@ class Minesweeper:
         stats_window.transient(self.tk)
         stats_window.grab_set()
         
+        # Performance counters are listed too while instrumentation is on
+        perf_rows = self.instrumentation.rows() if self.instrumentation.enabled else []
+        
         # Center the window
         w = 400
-        h = 300
+        h = 340 + (30 + 22 * len(perf_rows) if perf_rows else 0)
         ws = self.tk.winfo_screenwidth()
         hs = self.tk.winfo_screenheight()
         x = (ws/2) - (w/2)
@@ -1241,41 +1075,54 @@ class Minesweeper:
         stats_frame = Frame(stats_window, bg=self.colors["bg"], padx=20, pady=10)
         stats_frame.pack(fill="both", expand=True)
         
-        # Calculate progress
-        total_cells = self.size * self.size
-        non_mine_cells = total_cells - self.selected_mines
-        progress_pct = int((self.clicks / non_mine_cells) * 100) if non_mine_cells > 0 else 0
-        
-        # Display stats
-        stats = [
-            {"label": "Difficulty", "value": self.current_difficulty.capitalize()},
-            {"label": "Time Elapsed", "value": f"{self.time} seconds"},
-            {"label": "Uncovered Squares", "value": f"{self.clicks} out of {non_mine_cells}"},
-            {"label": "Completion Percentage", "value": f"{progress_pct}%"},
-            {"label": "Remaining Mines", "value": f"{self.selected_mines - self.flags}"},
-            {"label": "Hints Used", "value": f"{3 - self.hints_remaining} out of 3"}
-        ]
-        
-        # Add progress bar
-        progress_frame = Frame(stats_frame, bg=self.colors["bg"], pady=10)
-        progress_frame.pack(fill="x")
-        
-        Label(progress_frame, text="Progress:", font=("Arial", 12, "bold"), 
-             bg=self.colors["bg"], fg=self.colors["fg"]).pack(anchor="w")
-        
-        progress_bg = Frame(progress_frame, bg=self.colors["button_bg"], height=20, width=350)
-        progress_bg.pack(fill="x", pady=5)
-        
-        progress_bar = Frame(progress_bg, bg=self.colors["accent"], height=20, width=progress_pct*3.5)
-        progress_bar.place(x=0, y=0)
-        
-        progress_text = Label(progress_bar, text=f"{progress_pct}%", font=("Arial", 10, "bold"), 
-                            bg=self.colors["accent"], fg=self.colors["bg"])
-        progress_text.place(relx=0.5, rely=0.5, anchor="center")
+        # Calculate progress from the board's running counters; an endless
+        # board has no end to measure progress against
+        if self.board.mine_count is None:
+            stats = [
+                {"label": "Difficulty", "value": self.current_difficulty.capitalize()},
+                {"label": "Time Elapsed", "value": f"{self.time} seconds"},
+                {"label": "Uncovered Squares", "value": f"{self.board.revealed_count}"},
+                {"label": "Flags Placed", "value": f"{self.board.flag_count}"},
+                {"label": "Chunks Loaded", "value": f"{len(self.board.store.chunks)} of {self.board.store.generated} made"},
+                {"label": "Hints Used", "value": f"{3 - self.hints_remaining} out of 3"}
+            ]
+        else:
+            non_mine_cells = self.board.cells - self.board.mine_count
+            progress_pct = int((self.board.revealed_count / non_mine_cells) * 100) if non_mine_cells > 0 else 0
+            stats = [
+                {"label": "Difficulty", "value": self.current_difficulty.capitalize()},
+                {"label": "Time Elapsed", "value": f"{self.time} seconds"},
+                {"label": "Uncovered Squares", "value": f"{self.board.revealed_count} out of {non_mine_cells}"},
+                {"label": "Completion Percentage", "value": f"{progress_pct}%"},
+                {"label": "Remaining Mines", "value": f"{self.board.mines_remaining}"},
+                {"label": "Hints Used", "value": f"{3 - self.hints_remaining} out of 3"}
+            ]
+        
+        # The game ID reproduces this board once the mines are placed
+        if self.board.is_armed:
+            stats.append({"label": "Game ID", "value": self.board.game_id})
+        
+        # Add progress bar (endless boards have none)
+        if self.board.mine_count is not None:
+            progress_frame = Frame(stats_frame, bg=self.colors["bg"], pady=10)
+            progress_frame.pack(fill="x")
+        
+            Label(progress_frame, text="Progress:", font=("Arial", 12, "bold"), 
+                 bg=self.colors["bg"], fg=self.colors["fg"]).pack(anchor="w")
+        
+            progress_bg = Frame(progress_frame, bg=self.colors["button_bg"], height=20, width=350)
+            progress_bg.pack(fill="x", pady=5)
+        
+            progress_bar = Frame(progress_bg, bg=self.colors["accent"], height=20, width=progress_pct*3.5)
+            progress_bar.place(x=0, y=0)
+        
+            progress_text = Label(progress_bar, text=f"{progress_pct}%", font=("Arial", 10, "bold"), 
+                                bg=self.colors["accent"], fg=self.colors["bg"])
+            progress_text.place(relx=0.5, rely=0.5, anchor="center")
         
         # Stats table
         for i, stat in enumerate(stats):
-            if i != 2:  # Skip "Uncovered Squares" as we show it in progress bar
+            if i != 2 or self.board.mine_count is None:  # Skip "Uncovered Squares" as we show it in progress bar
                 Frame(stats_frame, height=1, bg=self.colors["button_bg"]).pack(fill="x", pady=5)
                 stat_frame = Frame(stats_frame, bg=self.colors["bg"])
                 stat_frame.pack(fill="x")
@@ -1286,6 +1133,30 @@ class Minesweeper:
                 Label(stat_frame, text=stat["value"], font=("Arial", 12, "bold"), 
                      bg=self.colors["bg"], fg=self.colors["accent"]).pack(side=LEFT)
         
+        # Live performance counters, refreshed while the window is open
+        if perf_rows:
+            Frame(stats_frame, height=1, bg=self.colors["button_bg"]).pack(fill="x", pady=5)
+            Label(stats_frame, text="Performance:", font=("Arial", 12, "bold"),
+                 bg=self.colors["bg"], fg=self.colors["fg"]).pack(anchor="w")
+            perf_labels = []
+            for name, value in perf_rows:
+                perf_frame = Frame(stats_frame, bg=self.colors["bg"])
+                perf_frame.pack(fill="x")
+                Label(perf_frame, text=name, font=("Arial", 10), width=20, anchor="w",
+                     bg=self.colors["bg"], fg=self.colors["fg"]).pack(side=LEFT)
+                perf_labels.append(Label(perf_frame, text=value, font=("Arial", 10, "bold"),
+                                         bg=self.colors["bg"], fg=self.colors["accent"]))
+                perf_labels[-1].pack(side=LEFT)
+            
+            def update_counters():
+                if not stats_window.winfo_exists():
+                    return
+                for label, (_, value) in zip(perf_labels, self.instrumentation.rows()):
+                    label.config(text=value)
+                self.tk.after(500, update_counters)
+            
+            self.tk.after(500, update_counters)
+        
         # Close button
         Button(stats_window, text="Close", command=stats_window.destroy, 
               font=("Arial", 12), bg=self.colors["button_bg"], fg=self.colors["fg"],
@@ -1293,6 +1164,9 @@ class Minesweeper:
 
 
 if __name__ == "__main__":
+    # Needed for the board generator's worker processes in frozen builds
+    multiprocessing.freeze_support()
+    
     # Create main window
     window = Tk()
     window.title("Minesweeper by Muhammad Saeed")
@@ -1316,3 +1190,8 @@ if __name__ == "__main__":
     
     # Run main loop
     window.mainloop()
+    
+    # Save the profile if instrumentation was used
+    game.instrumentation.dump()
+    game.stats.close()
+    game.no_guess_pool.close()
@@ -0,0 +1,31 @@
+"""
+Per-user folders for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Generated files that can be rebuilt (tile atlases, sounds, the no-guess
+pool, replays and profiles) go in the cache folder; the statistics
+database goes in the data folder. Nothing here needs Tk or PIL, so any
+module can use it.
+"""
+import os
+import sys
+
+
+def cache_dir():
+    """ Per-user folder for generated files """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or \
+            os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "minesweeper")
+
+
+def data_dir():
+    """ Per-user folder for the game's saved data """
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or \
+            os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "minesweeper")
@@ -0,0 +1,326 @@
+"""
+Mine probabilities for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+When the solver can't prove any cell safe, the player has to guess. This
+module works out how likely each hidden cell is to be a mine, using only
+what the player can see:
+
+- the undecided frontier is split into independent components, and every
+  mine arrangement of each component that fits the numbers is enumerated
+  and counted by how many mines it uses
+- the remaining mines are spread over the unconstrained interior cells, so
+  an arrangement with k frontier mines is weighted by C(interior, left - k)
+
+Component results are memoized, so after a click only the components that
+changed are enumerated again. Small components are always enumerated in
+full; bigger ones are enumerated while the time budget lasts, and the ones
+left over share what remains of it to be estimated from random solutions,
+in which case the result is marked as not exact.
+"""
+from math import exp, lgamma
+from random import Random
+import time
+
+# Enumerated components, keyed by their constraints
+component_cache = {}
+COMPONENT_CACHE_SIZE = 512
+
+# Components with at most this many cells are enumerated whatever the budget
+EXACT_SIZE = 12
+
+
+class Probabilities:
+    """ Mine probability of every hidden cell on a board """
+
+    def __init__(self, board, cells, interior, exact):
+        """ cells maps frontier and decided cells to their probability """
+        self.board = board
+        self.cells = cells
+        self.interior = interior
+        self.exact = exact
+
+    def __getitem__(self, i):
+        """ Probability that cell i is a mine (0 for revealed cells) """
+        if self.board.revealed[i]:
+            return 0.0
+        return self.cells.get(i, self.interior)
+
+    def safest(self):
+        """ The hidden, unflagged cell least likely to be a mine """
+        board = self.board
+        best, best_p = None, 2.0
+        for i, p in self.cells.items():
+            if p < best_p and not board.flagged[i]:
+                best, best_p = i, p
+
+        # Any interior cell is as good as another; only look for one if
+        # the interior is the better bet
+        if self.interior < best_p:
+            for i in range(board.cells):
+                if not board.revealed[i] and not board.flagged[i] and i not in self.cells:
+                    return i
+        return best
+
+
+def mine_probabilities(solver, time_budget=0.25, rng=None):
+    """ Work out a Probabilities map for the board the solver is watching """
+    board = solver.board
+    deadline = time.perf_counter() + time_budget
+    rng = rng or Random()
+
+    results = []
+    frontier_size = 0
+    pending = []
+    for cells, constraints in solver.frontier():
+        result, search = enumerate_component(constraints, deadline)
+        if result is None:
+            pending.append((cells, search))
+            continue
+        results.append(result)
+        frontier_size += len(cells)
+
+    # Share whatever time is left between the components still unknown
+    for n, (cells, search) in enumerate(pending):
+        now = time.perf_counter()
+        share = max(deadline - now, 0.0) / (len(pending) - n)
+        result = search.sample(rng, now + share)
+        if not result:
+            # Sampling found no arrangement in time: treat the component's
+            # cells like interior ones
+            continue
+        results.append(result)
+        frontier_size += len(cells)
+
+    # Mines and cells not accounted for by the solver or the frontier
+    hidden = board.cells - board.revealed_count - (board.exploded is not None)
+    interior = hidden - len(solver.mines) - len(solver.safe) - frontier_size
+    left = board.mine_count - len(solver.mines)
+
+    probabilities = {i: 1.0 for i in solver.mines}
+    probabilities.update((i, 0.0) for i in solver.safe)
+    interior_p = combine(results, interior, left, probabilities)
+    return Probabilities(board, probabilities, interior_p, not pending)
+
+
+def enumerate_component(constraints, deadline):
+    """ Count the mine arrangements of one frontier component
+
+    Returns ({mines: (ways, {cell: arrangements with a mine there})},
+    search), using the cache when the same component was seen before. The
+    result is None if the deadline passed first; search can then sample it.
+    """
+    key = frozenset(constraints)
+    if key in component_cache:
+        return component_cache[key], None
+
+    search = ComponentSearch(constraints)
+    if len(search.order) <= EXACT_SIZE:
+        deadline = None
+    result = search.run(deadline)
+    if result is not None:
+        if len(component_cache) >= COMPONENT_CACHE_SIZE:
+            del component_cache[next(iter(component_cache))]
+        component_cache[key] = result
+    return result, search
+
+
+class ComponentSearch:
+    """ Backtracking search over the cells of one frontier component """
+
+    def __init__(self, constraints):
+        """ Order the cells so that constraints fill up early """
+        # Visit cells constraint by constraint so partial assignments are
+        # checked as soon as possible
+        order = []
+        seen = set()
+        for cells, _ in sorted(constraints, key=lambda c: min(c[0])):
+            for i in sorted(cells):
+                if i not in seen:
+                    seen.add(i)
+                    order.append(i)
+        self.order = order
+        position = {cell: n for n, cell in enumerate(order)}
+
+        self.needs = [mines for _, mines in constraints]
+        self.sizes = [len(cells) for cells, _ in constraints]
+        self.watch = [[] for _ in order]
+        for c, (cells, _) in enumerate(constraints):
+            for i in cells:
+                self.watch[position[i]].append(c)
+
+    def run(self, deadline):
+        """ Enumerate every arrangement
+
+        Returns None if the deadline passed before the search finished; a
+        deadline of None lets the search run to the end.
+        """
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+
+        n = len(self.order)
+        need = list(self.needs)
+        left = list(self.sizes)
+        watch = self.watch
+        choice = [-1] * n
+        results = {}
+
+        def assign(pos, value):
+            """ Place value at pos if every constraint can still be met """
+            ok = True
+            for c in watch[pos]:
+                left[c] -= 1
+                need[c] -= value
+                if need[c] < 0 or need[c] > left[c]:
+                    ok = False
+            if not ok:
+                unassign(pos, value)
+            return ok
+
+        def unassign(pos, value):
+            for c in watch[pos]:
+                left[c] += 1
+                need[c] += value
+
+        steps = 0
+        pos = 0
+        while pos >= 0:
+            if pos == n:
+                # A full arrangement that fits every number
+                mines = sum(choice)
+                ways, counts = results.get(mines, (0, None))
+                if counts is None:
+                    counts = [0] * n
+                for k in range(n):
+                    counts[k] += choice[k]
+                results[mines] = (ways + 1, counts)
+                pos -= 1
+                continue
+
+            steps += 1
+            if deadline is not None and steps & 1023 == 0 and time.perf_counter() > deadline:
+                return None
+
+            # Try the next value at this position: 0, then 1, then go back
+            value = choice[pos]
+            if value >= 0:
+                unassign(pos, value)
+            value += 1
+            while value <= 1 and not assign(pos, value):
+                value += 1
+
+            if value <= 1:
+                choice[pos] = value
+                pos += 1
+            else:
+                choice[pos] = -1
+                pos -= 1
+
+        return {mines: (ways, dict(zip(self.order, counts)))
+                for mines, (ways, counts) in results.items()}
+
+    def sample(self, rng, end):
+        """ Estimate the enumeration from random arrangements
+
+        Each sample assigns the cells in order, picking a random value
+        whenever both fit and weighting the result by the inverse of the
+        chance of those picks (Knuth's estimator), so the expected weights
+        match the exact counts. Samples that hit a dead end count as zero.
+        At least one sample is taken, then sampling stops at end.
+        """
+        n = len(self.order)
+        watch = self.watch
+        results = {}
+        while True:
+            need = list(self.needs)
+            left = list(self.sizes)
+            choice = []
+            weight = 1.0
+            for pos in range(n):
+                fits = [value for value in (0, 1)
+                        if all(0 <= need[c] - value <= left[c] - 1 for c in watch[pos])]
+                if not fits:
+                    break
+                value = fits[0]
+                if len(fits) == 2:
+                    # Lean towards the mine density the numbers ask for
+                    density = sum(need[c] / left[c] for c in watch[pos]) / len(watch[pos])
+                    density = min(max(density, 0.05), 0.95)
+                    value = 1 if rng.random() < density else 0
+                    weight /= density if value else 1 - density
+                for c in watch[pos]:
+                    left[c] -= 1
+                    need[c] -= value
+                choice.append(value)
+            else:
+                mines = sum(choice)
+                ways, counts = results.get(mines, (0.0, dict.fromkeys(self.order, 0.0)))
+                for i, value in zip(self.order, choice):
+                    if value:
+                        counts[i] += weight
+                results[mines] = (ways + weight, counts)
+            if time.perf_counter() >= end:
+                return results
+
+
+def log_choose(n, k):
+    """ log(C(n, k)) """
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def convolve(a, b):
+    """ Mine count distribution of two independent parts """
+    result = {}
+    for ka, wa in a.items():
+        for kb, wb in b.items():
+            result[ka + kb] = result.get(ka + kb, 0.0) + wa * wb
+    return result
+
+
+def combine(results, interior, left, probabilities):
+    """ Fill in frontier probabilities and return the interior one """
+    # Scale each component so the numbers stay in float range; a constant
+    # factor per component cancels out in every probability
+    weights = []
+    for result in results:
+        top = max(ways for ways, _ in result.values())
+        weights.append({k: ways / top for k, (ways, _) in result.items()})
+
+    # Weight of placing the other left - k mines in the interior
+    def interior_weights(ks):
+        logs = {k: log_choose(interior, left - k) for k in ks if 0 <= left - k <= interior}
+        if not logs:
+            return {}
+        top = max(logs.values())
+        return {k: exp(v - top) for k, v in logs.items()}
+
+    # Distribution of the other components, for each component in turn
+    prefix = [{0: 1.0}]
+    for w in weights:
+        prefix.append(convolve(prefix[-1], w))
+    suffix = [{0: 1.0}]
+    for w in reversed(weights):
+        suffix.append(convolve(suffix[-1], w))
+    suffix.reverse()
+
+    everything = prefix[-1]
+    outside = interior_weights(everything)
+    total = sum(everything[k] * outside[k] for k in outside)
+    if total == 0:
+        return left / interior if interior else 0.0
+
+    for j, result in enumerate(results):
+        others = convolve(prefix[j], suffix[j + 1])
+        scale = max(ways for ways, _ in result.values())
+        for k, (ways, counts) in result.items():
+            factor = sum(wo * outside.get(k + ko, 0.0) for ko, wo in others.items())
+            if not factor:
+                continue
+            factor /= scale * total
+            for i, count in counts.items():
+                probabilities[i] = probabilities.get(i, 0.0) + count * factor
+
+    if not interior:
+        return 0.0
+    expected = sum(everything[k] * outside[k] * (left - k) for k in outside) / total
+    return expected / interior
@@ -0,0 +1,180 @@
+"""
+Performance instrumentation for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Off by default and free when off. Turn it on with MINESWEEPER_PROFILE=1
+in the environment, or with the hidden F12 key while the game runs. While
+it is on:
+
+- the engine and renderer hot paths listed in PROBES are timed
+- the depth of Tk's "after" callback queue is sampled twice a second
+- a cProfile profiler runs on the UI thread
+
+The counters are shown live in the Game Statistics window, and on exit the
+profile and a copy of the counters are written to the user's cache folder
+so they can be attached to bug reports.
+"""
+from tkinter import TclError
+import cProfile
+import functools
+import os
+import sys
+import threading
+import time
+
+from board import Board
+from endless import ChunkStore
+from paths import cache_dir
+from renderer import TileRenderer, VirtualTileRenderer
+from solver import Solver
+
+# (class, method, counter name) of every timed hot path
+PROBES = [
+    (Board, "place_mines", "Mine generation"),
+    (Board, "clear_area", "First click moves"),
+    (Board, "count_mines", "Neighbour counting"),
+    (Board, "_flood_fill", "Flood fill batches"),
+    (ChunkStore, "generate", "Endless chunks"),
+    (Solver, "solve", "Solver"),
+    (TileRenderer, "flush", "Tile updates"),
+    (VirtualTileRenderer, "update_viewport", "Viewport updates")
+]
+
+# Environment variable that turns instrumentation on at startup
+ENV_VAR = "MINESWEEPER_PROFILE"
+
+
+class Counter:
+    """ Number of calls and time spent in one probe """
+
+    def __init__(self):
+        """ Start with no calls """
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.last = 0.0
+
+    def add(self, seconds):
+        """ Record one call """
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.worst = max(self.worst, seconds)
+
+    def summary(self):
+        """ Short text for the stats window, e.g. "12 x 0.41 ms (max 1.2)" """
+        if not self.count:
+            return "-"
+        average = self.total / self.count * 1000
+        return f"{self.count} x {average:.2f} ms (max {self.worst * 1000:.1f})"
+
+
+class Instrumentation:
+    """ Opt-in timers, after queue sampling and profiling for the game """
+
+    def __init__(self, root, sample_interval=500):
+        """ root is the Tk window whose after queue is sampled """
+        self.root = root
+        self.sample_interval = sample_interval
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.counters = {name: Counter() for _, _, name in PROBES}
+        self.originals = []
+        self.profiler = None
+        self.sampling = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+        if os.environ.get(ENV_VAR, "") not in ("", "0"):
+            self.enable()
+
+    def enable(self):
+        """ Start timing, sampling and profiling """
+        if self.enabled:
+            return
+        self.enabled = True
+        for cls, method, name in PROBES:
+            self.wrap(cls, method, name)
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        self.sample_queue()
+
+    def disable(self):
+        """ Put the original methods back; collected numbers are kept """
+        if not self.enabled:
+            return
+        self.enabled = False
+        for cls, method, original in reversed(self.originals):
+            setattr(cls, method, original)
+        self.originals.clear()
+        self.profiler.disable()
+        if self.sampling is not None:
+            try:
+                self.root.after_cancel(self.sampling)
+            except TclError:
+                # The window is already gone
+                pass
+            self.sampling = None
+
+    def toggle(self):
+        """ Switch instrumentation on or off, returns the new state """
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def wrap(self, cls, method, name):
+        """ Replace cls.method with a version that times every call """
+        original = cls.__dict__[method]
+        counter = self.counters[name]
+        lock = self.lock
+        perf_counter = time.perf_counter
+
+        # Boards are also made on the producer thread, hence the lock
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                with lock:
+                    counter.add(elapsed)
+
+        self.originals.append((cls, method, original))
+        setattr(cls, method, timed)
+
+    def sample_queue(self):
+        """ Note how many after callbacks are waiting to run """
+        pending = self.root.tk.splitlist(self.root.tk.call("after", "info"))
+        self.queue_depth = len(pending)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        self.sampling = self.root.after(self.sample_interval, self.sample_queue)
+
+    def rows(self):
+        """ (name, value) pairs for the stats window, always in the same order """
+        with self.lock:
+            rows = [(name, counter.summary()) for name, counter in self.counters.items()]
+        rows.append(("After queue", f"{self.queue_depth} (max {self.max_queue_depth})"))
+        return rows
+
+    def dump(self):
+        """ Write the profile and counters to the cache folder, returns the path """
+        if self.profiler is None:
+            return None
+        self.disable()
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(cache_dir(), f"profile-{stamp}.prof")
+        try:
+            os.makedirs(cache_dir(), exist_ok=True)
+            self.profiler.dump_stats(path)
+            with open(os.path.join(cache_dir(), f"profile-{stamp}.txt"), "w") as file:
+                for name, value in self.rows():
+                    file.write(f"{name}: {value}\n")
+        except OSError:
+            return None
+        print(f"Profile written to {path}", file=sys.stderr)
+        return path
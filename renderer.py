@@ -0,0 +1,447 @@
+"""
+Canvas tile renderer for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+The whole board is drawn on one Canvas with an image item per cell instead
+of one Button widget per cell. Clicks are mapped back to cells with simple
+arithmetic and only the items of cells that changed are reconfigured.
+
+Redraws are batched: refresh() only marks cells as dirty, and once per tick
+of the event loop the dirty cells are sent to Tk as a single script. A cell
+marked several times is drawn once, items that already show the right
+image are skipped, and at most frame_budget cells are drawn per tick so a
+huge reveal never freezes the window.
+
+VirtualTileRenderer is the variant for large, scrollable boards: it only
+keeps items for the cells inside the visible part of the canvas (plus a
+margin) and moves them around as the view scrolls, so drawing cost depends
+on the window size and not on the board size.
+"""
+from itertools import islice
+from tkinter import Canvas, Frame, Scrollbar, HORIZONTAL, VERTICAL
+
+
+class TileRenderer:
+    """ Draws a Board on a single Canvas """
+
+    # Most cells redrawn in one tick of the event loop
+    frame_budget = 4096
+
+    def __init__(self, master, board, images, padding=0, bg=None):
+        """ Create the canvas and one image item per cell """
+        self.board = board
+        self.images = images
+        self.padding = padding
+        self.tile_size = images["tile"].width()
+        self.pitch = self.tile_size + 2 * padding
+
+        # Once the game is over, hidden mines and wrong flags are shown
+        self.game_over = False
+
+        # Cells waiting to be redrawn (a dict keeps them in order), the
+        # image each item shows, and the scheduled flush
+        self.dirty = {}
+        self.shown = {}
+        self.flushing = None
+
+        self.canvas = Canvas(master, bg=bg, highlightthickness=0, borderwidth=0)
+        self.create_items()
+
+    def create_items(self):
+        """ Size the canvas to the board and create one image item per cell """
+        self.canvas.configure(width=self.board.cols * self.pitch,
+                              height=self.board.rows * self.pitch)
+
+        # Item ids are stored in board order, so item i draws cell i
+        create_image = self.canvas.create_image
+        tile = self.images["tile"]
+        pitch = self.pitch
+        padding = self.padding
+        self.items = [create_image(y * pitch + padding, x * pitch + padding,
+                                   image=tile, anchor="nw")
+                      for x in range(self.board.rows)
+                      for y in range(self.board.cols)]
+        self.shown = dict.fromkeys(self.items, tile)
+
+    def item_for(self, i):
+        """ The canvas item drawing cell i, or None if it has none """
+        return self.items[i]
+
+    def drawn_cells(self):
+        """ Indices of the cells that currently have an item """
+        return range(self.board.cells)
+
+    def set_board(self, board):
+        """ Show a new board of the same size on the existing canvas """
+        self.board = board
+        self.game_over = False
+        self.canvas.delete("overlay")
+        self.refresh_all()
+
+    def pack(self, **kwargs):
+        """ Pack the renderer's widgets into their master """
+        self.canvas.pack(**kwargs)
+
+    def bind(self, left_click, right_click):
+        """ Send clicks on the canvas to left_click(x, y)/right_click(x, y) """
+        def dispatch(event, handler):
+            cell = self.cell_at(event.x, event.y)
+            if cell is not None:
+                handler(*cell)
+
+        self.canvas.bind("<Button-1>", lambda e: dispatch(e, left_click))
+        self.canvas.bind("<Button-3>", lambda e: dispatch(e, right_click))
+
+    def cell_at(self, px, py):
+        """ (x, y) of the cell under a widget pixel, or None if off board """
+        x = int(self.canvas.canvasy(py)) // self.pitch
+        y = int(self.canvas.canvasx(px)) // self.pitch
+        if 0 <= x < self.board.rows and 0 <= y < self.board.cols:
+            return x, y
+        return None
+
+    def image_for(self, i):
+        """ The image that shows the current state of cell i """
+        board = self.board
+        images = self.images
+        if board.revealed[i]:
+            if board.mines[i]:
+                return images["clicked_mine"]
+            return images["numbers"][board.counts[i]]
+        if board.flagged[i]:
+            if self.game_over and not board.mines[i]:
+                return images["wrong_flag"]
+            return images["flag"]
+        if self.game_over and board.mines[i]:
+            return images["mine"]
+        return images["tile"]
+
+    def refresh(self, indices):
+        """ Redraw the given cells from the board state on the next tick """
+        self.dirty.update(dict.fromkeys(indices))
+        if self.dirty and self.flushing is None:
+            self.flushing = self.canvas.after_idle(self.flush)
+
+    def flush(self):
+        """ Draw up to frame_budget dirty cells, leaving the rest for later """
+        self.flushing = None
+        dirty = self.dirty
+        if len(dirty) <= self.frame_budget:
+            batch, self.dirty = dirty, {}
+        else:
+            batch = list(islice(dirty, self.frame_budget))
+            for i in batch:
+                del dirty[i]
+        self.draw(batch)
+
+        # Let Tk handle input and repaint before the next batch
+        if self.dirty:
+            self.flushing = self.canvas.after(1, self.flush)
+
+    def draw(self, indices):
+        """ Show the current image of each cell, all in one Tcl call """
+        path = str(self.canvas)
+        shown = self.shown
+        item_for = self.item_for
+        commands = []
+        for i in indices:
+            item = item_for(i)
+            if item is None:
+                continue
+            image = self.image_for(i)
+            if shown.get(item) is not image:
+                shown[item] = image
+                commands.append(f"{path} itemconfigure {item} -image {image}")
+        if commands:
+            self.canvas.tk.eval("\n".join(commands))
+
+    def refresh_all(self):
+        """ Redraw every drawn cell """
+        self.refresh(self.drawn_cells())
+
+    def reveal_mines(self):
+        """ Switch to the game over view: show hidden mines and wrong flags """
+        board = self.board
+        self.game_over = True
+        self.refresh([i for i in range(board.cells)
+                      if not board.revealed[i] and board.mines[i] != board.flagged[i]])
+
+    def show_image(self, i, image):
+        """ Draw cell i with a different image until it is refreshed """
+        self.dirty.pop(i, None)
+        item = self.item_for(i)
+        if item is not None:
+            self.shown[item] = image
+            self.canvas.itemconfigure(item, image=image)
+
+    def cell_box(self, i):
+        """ Canvas coordinates of the tile of cell i """
+        x, y = self.board.coords(i)
+        left = y * self.pitch + self.padding
+        top = x * self.pitch + self.padding
+        return left, top, left + self.tile_size, top + self.tile_size
+
+    def show_heat_map(self, probabilities):
+        """ Shade hidden cells from green (likely safe) to red (likely mine) """
+        self.clear_heat_map()
+        board = self.board
+        for i in self.drawn_cells():
+            if board.revealed[i] or board.flagged[i]:
+                continue
+            p = probabilities[i]
+            color = "#{:02X}{:02X}00".format(int(255 * p), int(255 * (1 - p)))
+            self.canvas.create_rectangle(*self.cell_box(i), fill=color, outline="",
+                                         stipple="gray50", tags=("overlay", "heatmap"))
+
+    def clear_heat_map(self):
+        """ Remove the probability shading """
+        self.canvas.delete("heatmap")
+
+    def highlight(self, i, color):
+        """ Draw a coloured frame around cell i and return its item id """
+        left, top, right, bottom = self.cell_box(i)
+        return self.canvas.create_rectangle(left + 1, top + 1, right - 1, bottom - 1,
+                                            outline=color, width=2, tags="overlay")
+
+
+class VirtualTileRenderer(TileRenderer):
+    """ Draws only the visible part of a Board on a scrollable Canvas """
+
+    # Extra rows and columns kept around the visible area
+    margin = 4
+
+    def __init__(self, master, board, images, padding=0, bg=None,
+                 width=440, height=440):
+        """ Create the scrollable canvas; items are made once it is shown """
+        self.container = Frame(master, bg=bg)
+        self.view_width = width
+        self.view_height = height
+        super().__init__(self.container, board, images, padding, bg)
+
+    def create_items(self):
+        """ Set up the scroll region and the pool of reusable items """
+        board = self.board
+        canvas = self.canvas
+        canvas.configure(width=min(self.view_width, board.cols * self.pitch),
+                         height=min(self.view_height, board.rows * self.pitch),
+                         scrollregion=(0, 0, board.cols * self.pitch,
+                                       board.rows * self.pitch))
+
+        # Scrollbars also trigger a redraw of the newly visible cells
+        v_scrollbar = Scrollbar(self.container, orient=VERTICAL, command=canvas.yview)
+        h_scrollbar = Scrollbar(self.container, orient=HORIZONTAL, command=canvas.xview)
+        canvas.configure(yscrollcommand=lambda *args: self.on_scroll(v_scrollbar, args),
+                         xscrollcommand=lambda *args: self.on_scroll(h_scrollbar, args))
+        self.scrollbars = (v_scrollbar, h_scrollbar)
+
+        # Cell index -> item for materialized cells, plus spare items
+        self.visible = {}
+        self.spare = []
+        self.view = None
+        self.pending = None
+        canvas.bind("<Configure>", lambda e: self.schedule_update())
+
+    def item_for(self, i):
+        """ The canvas item drawing cell i, or None if it is off screen """
+        return self.visible.get(i)
+
+    def refresh(self, indices):
+        """ Redraw the given cells that are in view on the next tick """
+        # Cells out of view are drawn from the board when they scroll in
+        visible = self.visible
+        super().refresh([i for i in indices if i in visible])
+
+    def reveal_mines(self):
+        """ Switch to the game over view without visiting every cell """
+        self.game_over = True
+        self.refresh_all()
+
+    def pack(self, **kwargs):
+        """ Pack the canvas with its scrollbars """
+        v_scrollbar, h_scrollbar = self.scrollbars
+        v_scrollbar.pack(side="right", fill="y")
+        h_scrollbar.pack(side="bottom", fill="x")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.container.pack(**kwargs)
+
+    def on_scroll(self, scrollbar, args):
+        """ Move the scrollbar and redraw the cells that came into view """
+        scrollbar.set(*args)
+        self.schedule_update()
+
+    def schedule_update(self):
+        """ Update the viewport once the current burst of events is over """
+        if self.pending is None:
+            self.pending = self.canvas.after_idle(self.update_viewport)
+
+    def visible_range(self):
+        """ First and last+1 row and column of the cells to materialize """
+        canvas = self.canvas
+        left = int(canvas.canvasx(0))
+        top = int(canvas.canvasy(0))
+        right = left + max(canvas.winfo_width(), 1)
+        bottom = top + max(canvas.winfo_height(), 1)
+        return (max(top // self.pitch - self.margin, 0),
+                min(bottom // self.pitch + 1 + self.margin, self.board.rows),
+                max(left // self.pitch - self.margin, 0),
+                min(right // self.pitch + 1 + self.margin, self.board.cols))
+
+    def update_viewport(self):
+        """ Recycle items that left the view and draw the cells that entered """
+        self.pending = None
+        view = self.visible_range()
+        if view == self.view:
+            return
+        self.view = view
+        top, bottom, left, right = view
+
+        canvas = self.canvas
+        board = self.board
+        visible = self.visible
+        spare = self.spare
+
+        # Release the items of cells that are now out of range, hidden so
+        # a spare left over when the view shrinks shows no stale tile
+        path = str(canvas)
+        commands = []
+        for i in list(visible):
+            x, y = board.coords(i)
+            if not (top <= x < bottom and left <= y < right):
+                item = visible.pop(i)
+                spare.append(item)
+                commands.append(f"{path} itemconfigure {item} -state hidden")
+
+        # Give every newly visible cell an item, reusing spare ones first;
+        # hiding, moving and redrawing the items is sent as one script
+        pitch = self.pitch
+        padding = self.padding
+        shown = self.shown
+        for x in range(top, bottom):
+            for y in range(left, right):
+                i = board.index(x, y)
+                if i in visible:
+                    continue
+                image = self.image_for(i)
+                if spare:
+                    item = spare.pop()
+                    commands.append(f"{path} coords {item} {y * pitch + padding} "
+                                    f"{x * pitch + padding}")
+                    if shown.get(item) is not image:
+                        commands.append(f"{path} itemconfigure {item} -image {image} "
+                                        "-state normal")
+                    else:
+                        commands.append(f"{path} itemconfigure {item} -state normal")
+                else:
+                    item = canvas.create_image(y * pitch + padding, x * pitch + padding,
+                                               image=image, anchor="nw")
+                shown[item] = image
+                visible[i] = item
+        if commands:
+            canvas.tk.eval("\n".join(commands))
+
+        # Highlights and other overlays stay above the tiles
+        canvas.tag_raise("overlay")
+
+    def drawn_cells(self):
+        """ Indices of the cells that are materialized right now """
+        return list(self.visible)
+
+
+class EndlessRenderer(VirtualTileRenderer):
+    """ Streams the cells around the view of an EndlessBoard onto a Canvas """
+
+    # Pixels moved by an arrow key or a turn of the mouse wheel
+    pan_step = 60
+
+    def create_items(self):
+        """ Set up an unbounded view, panned by dragging or with the keys """
+        canvas = self.canvas
+        canvas.configure(width=self.view_width, height=self.view_height, confine=False)
+        self.scrollbars = ()
+
+        # Cell key -> item for materialized cells, plus spare items
+        self.visible = {}
+        self.spare = []
+        self.view = None
+        self.pending = None
+        self.centered = False
+        canvas.bind("<Configure>", lambda e: self.on_configure())
+
+        # Drag with the middle button, or scroll with the wheel and arrows
+        canvas.bind("<ButtonPress-2>", lambda e: canvas.scan_mark(e.x, e.y))
+        canvas.bind("<B2-Motion>", self.on_drag)
+        canvas.bind("<MouseWheel>", lambda e: self.on_wheel(e, -e.delta // 120))
+        canvas.bind("<Shift-MouseWheel>", lambda e: self.on_wheel(e, -e.delta // 120, True))
+        canvas.bind("<Button-4>", lambda e: self.on_wheel(e, -1))
+        canvas.bind("<Button-5>", lambda e: self.on_wheel(e, 1))
+        canvas.bind("<Shift-Button-4>", lambda e: self.on_wheel(e, -1, True))
+        canvas.bind("<Shift-Button-5>", lambda e: self.on_wheel(e, 1, True))
+        for key, dx, dy in (("Left", -1, 0), ("Right", 1, 0), ("Up", 0, -1), ("Down", 0, 1)):
+            canvas.bind(f"<{key}>", lambda e, dx=dx, dy=dy: self.pan(dx * self.pan_step,
+                                                                     dy * self.pan_step))
+        canvas.bind("<Enter>", lambda e: canvas.focus_set())
+
+    def pack(self, **kwargs):
+        """ Pack the canvas, which fills its container """
+        self.canvas.pack(fill="both", expand=True)
+        self.container.pack(**kwargs)
+
+    def set_board(self, board):
+        """ Show a new board, starting again from the middle """
+        super().set_board(board)
+        self.center()
+
+    def on_configure(self):
+        """ Put the origin in the middle once the canvas has a size """
+        if not self.centered:
+            self.center()
+        self.schedule_update()
+
+    def on_drag(self, event):
+        """ Move the view with the mouse """
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_update()
+
+    def on_wheel(self, event, steps, sideways=False):
+        """ Move the view up/down, or left/right with Shift held """
+        if sideways:
+            self.pan(steps * self.pan_step, 0)
+        else:
+            self.pan(0, steps * self.pan_step)
+
+    def pan(self, dx, dy):
+        """ Move the view by (dx, dy) pixels """
+        canvas = self.canvas
+        canvas.scan_mark(0, 0)
+        canvas.scan_dragto(-dx, -dy, gain=1)
+        self.schedule_update()
+
+    def center(self, x=0, y=0):
+        """ Move the view so cell (x, y) is in the middle """
+        canvas = self.canvas
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        self.centered = width > 1
+        self.pan(int(y * self.pitch - width // 2 - canvas.canvasx(0)),
+                 int(x * self.pitch - height // 2 - canvas.canvasy(0)))
+
+    def cell_at(self, px, py):
+        """ (x, y) of the cell under a widget pixel; every pixel has one """
+        return (int(self.canvas.canvasy(py)) // self.pitch,
+                int(self.canvas.canvasx(px)) // self.pitch)
+
+    def visible_range(self):
+        """ First and last+1 row and column of the cells to materialize """
+        canvas = self.canvas
+        left = int(canvas.canvasx(0))
+        top = int(canvas.canvasy(0))
+        right = left + max(canvas.winfo_width(), 1)
+        bottom = top + max(canvas.winfo_height(), 1)
+        return (top // self.pitch - self.margin, bottom // self.pitch + 1 + self.margin,
+                left // self.pitch - self.margin, right // self.pitch + 1 + self.margin)
+
+    def update_viewport(self):
+        """ Draw the cells that came into view and keep their chunks cached """
+        super().update_viewport()
+        if self.view is not None:
+            self.board.store.touch(*self.view)
@@ -0,0 +1,413 @@
+"""
+Game recording and replay for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Every game is recorded as it is played: a Recorder writes the board's game
+ID, then one small fixed-size record per click - milliseconds since the
+game started, the action and the cell - and flushes each one, so a log can
+be read while it is still being written and survives a crash up to the
+last click. Recordings go to the "replays" folder of the user's cache
+folder, and only the most recent REPLAY_LIMIT are kept.
+
+A Player rebuilds the board from the game ID and applies the clicks, either
+headless at full speed or drawn by a renderer with the original timing.
+Every SNAPSHOT_INTERVAL moves it keeps a snapshot of the board, so seeking
+to any move only replays the moves since the nearest snapshot:
+
+    python replay.py                                  # list recent recordings
+    python replay.py replay-20250101-120000-000.msr   # analyse one
+    python replay.py last --watch --speed 4           # watch it, 4x faster
+"""
+from tkinter import Label, Tk
+import argparse
+import os
+import struct
+import time
+
+from board import Board
+from endless import EndlessBoard
+from paths import cache_dir
+from renderer import EndlessRenderer, TileRenderer, VirtualTileRenderer
+from tiles import ModernTiles, tile_cache
+
+# File header: magic and length of the game ID that follows it
+HEADER = struct.Struct("<4sH")
+MAGIC = b"MSR1"
+
+# One click: milliseconds since the start, action, x, y
+EVENT = struct.Struct("<IBii")
+
+# Actions
+REVEAL = 0
+FLAG = 1
+ACTION_NAMES = {REVEAL: "reveal", FLAG: "flag"}
+
+# Recordings kept in the cache folder, oldest removed first
+REPLAY_LIMIT = 50
+
+# Moves between board snapshots taken while playing
+SNAPSHOT_INTERVAL = 50
+
+
+def replay_dir():
+    """ Folder the game's recordings are written to """
+    return os.path.join(cache_dir(), "replays")
+
+
+def recent_replays():
+    """ Paths of the recordings in replay_dir(), oldest first """
+    try:
+        names = sorted(name for name in os.listdir(replay_dir()) if name.endswith(".msr"))
+    except OSError:
+        return []
+    return [os.path.join(replay_dir(), name) for name in names]
+
+
+def board_from_game_id(game_id):
+    """ A fresh board for a game ID of either kind of board """
+    if game_id.startswith("endless-"):
+        return EndlessBoard.from_game_id(game_id)
+    return Board.from_game_id(game_id)
+
+
+class Recorder:
+    """ Streams the clicks of one game to a log file """
+
+    def __init__(self, game_id, path=None):
+        """ Log the board with this game ID; path defaults to a new file in
+        replay_dir(). The file is only created once there is a click. """
+        if path is None:
+            now = time.time()
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+            path = os.path.join(replay_dir(), f"replay-{stamp}-{int(now * 1000) % 1000:03d}.msr")
+        self.game_id = game_id
+        self.path = path
+        self.start = time.monotonic()
+        self.file = None
+        self.failed = False
+
+    def open(self):
+        """ Create the file and write the header """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, "wb")
+            data = self.game_id.encode()
+            self.file.write(HEADER.pack(MAGIC, len(data)) + data)
+        except OSError:
+            # Recording is best effort: the game goes on without it
+            self.failed = True
+            self.close()
+            return
+        self.prune()
+
+    def record(self, action, x, y):
+        """ Append a click, timestamped from the start of the game """
+        if self.file is None:
+            if self.failed:
+                return
+            self.open()
+            if self.file is None:
+                return
+        elapsed = int((time.monotonic() - self.start) * 1000)
+        try:
+            self.file.write(EVENT.pack(elapsed, action, x, y))
+            self.file.flush()
+        except OSError:
+            self.failed = True
+            self.close()
+
+    def close(self):
+        """ Finish the log """
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+    def prune(self):
+        """ Delete the oldest recordings beyond REPLAY_LIMIT """
+        if os.path.dirname(self.path) != replay_dir():
+            return
+        for path in recent_replays()[:-REPLAY_LIMIT]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class Replay:
+    """ A recorded game: its game ID and (ms, action, x, y) of every click """
+
+    def __init__(self, game_id, events):
+        """ events are in the order they were played """
+        self.game_id = game_id
+        self.events = events
+
+    @classmethod
+    def load(cls, path):
+        """ Read a log; a last record cut short by a crash is ignored """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Not a replay: {path}")
+            magic, length = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Not a replay: {path}")
+            game_id = file.read(length).decode()
+            data = file.read()
+        usable = len(data) - len(data) % EVENT.size
+        return cls(game_id, list(EVENT.iter_unpack(data[:usable])))
+
+    @property
+    def duration(self):
+        """ Seconds from the start of the game to the last click """
+        return self.events[-1][0] / 1000 if self.events else 0.0
+
+
+class Player:
+    """ Applies the clicks of a Replay to a board, with seeking """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        """ Start before the first move """
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.board = board_from_game_id(replay.game_id)
+        self.position = 0
+        self.snapshots = {}
+
+        # Set while playing in real time
+        self.renderer = None
+        self.speed = 1.0
+        self.pending = None
+        self.on_move = None
+
+    def __len__(self):
+        """ Number of moves in the replay """
+        return len(self.replay.events)
+
+    def step(self):
+        """ Apply the next move, returns the cells that changed """
+        _, action, x, y = self.replay.events[self.position]
+        board = self.board
+        if action == FLAG:
+            changed = [board.index(x, y)] if board.toggle_flag(x, y) else []
+        else:
+            if not board.is_armed:
+                board.arm(x, y)
+            changed = board.reveal(x, y)
+        self.position += 1
+
+        # Snapshots are only taken once the mines are final
+        if self.position % self.snapshot_interval == 0 and board.is_armed and \
+                self.position not in self.snapshots:
+            self.snapshots[self.position] = board.snapshot()
+        return changed
+
+    def seek(self, position):
+        """ Move to just after move number position, forwards or backwards """
+        position = max(0, min(position, len(self)))
+        start = max((p for p in self.snapshots if p <= position), default=0)
+        if position < self.position or start > self.position:
+            if start:
+                # Snapshots hold no mines: lay them out as the first reveal did
+                if not self.board.is_armed:
+                    self.board.arm(*next((x, y) for _, action, x, y in self.replay.events
+                                         if action == REVEAL))
+                self.board.restore(self.snapshots[start])
+            else:
+                self.board = board_from_game_id(self.replay.game_id)
+            self.position = start
+        while self.position < position:
+            self.step()
+
+    def play(self):
+        """ Apply every remaining move as fast as possible, returns the board """
+        while self.position < len(self):
+            self.step()
+        return self.board
+
+    def watch(self, renderer, speed=1.0, on_move=None):
+        """ Play the remaining moves on a renderer with their original timing,
+        speed times faster; on_move(player) is called after every move """
+        self.renderer = renderer
+        self.speed = speed
+        self.on_move = on_move
+        renderer.set_board(self.board)
+        self.schedule()
+
+    def schedule(self):
+        """ Play the next move after the time the player took for it """
+        self.pause()
+        if self.position >= len(self):
+            return
+        events = self.replay.events
+        previous = events[self.position - 1][0] if self.position else 0
+        delay = int((events[self.position][0] - previous) / self.speed)
+        self.pending = self.renderer.canvas.after(max(delay, 1), self.advance)
+
+    def advance(self):
+        """ Play one move on the renderer and wait for the next """
+        self.pending = None
+        self.show(self.step())
+        self.schedule()
+
+    def pause(self):
+        """ Stop playing in real time """
+        if self.pending is not None:
+            self.renderer.canvas.after_cancel(self.pending)
+            self.pending = None
+
+    @property
+    def paused(self):
+        """ True unless a move is waiting to be played in real time """
+        return self.pending is None
+
+    def jump(self, position):
+        """ Seek while watching and redraw the board """
+        board = self.board
+        self.seek(position)
+        if self.board is not board:
+            self.renderer.set_board(self.board)
+        self.renderer.game_over = False
+        self.show(self.renderer.drawn_cells())
+
+    def show(self, changed):
+        """ Draw the cells a move changed and the mines once it is lost """
+        renderer = self.renderer
+        if self.board.exploded is not None and not renderer.game_over:
+            renderer.reveal_mines()
+        else:
+            renderer.refresh(changed)
+        if self.on_move is not None:
+            self.on_move(self)
+
+
+def analyse(replay, top=5):
+    """ Print a summary of a replay and its slowest moves """
+    events = replay.events
+    print(f"Game ID   {replay.game_id}")
+    print(f"Moves     {len(events)} ({sum(e[1] == FLAG for e in events)} flags)")
+    print(f"Duration  {replay.duration:.1f} s")
+
+    player = Player(replay)
+    start = time.perf_counter()
+    board = player.play()
+    elapsed = time.perf_counter() - start
+    if board.exploded is not None:
+        result = "lost"
+    elif board.is_won():
+        result = "won"
+    else:
+        result = "unfinished"
+    print(f"Result    {result}, {board.revealed_count} cells revealed")
+    print(f"Replayed  in {elapsed * 1000:.1f} ms ({len(events) / (elapsed or 1e-9):.0f} moves/s)")
+
+    # The longest thinking times, with the move that followed each
+    gaps = sorted(((events[n][0] - (events[n - 1][0] if n else 0), n)
+                   for n in range(len(events))), reverse=True)[:top]
+    if gaps:
+        print("Slowest moves:")
+        for gap, n in gaps:
+            _, action, x, y = events[n]
+            print(f"  #{n + 1:<5} {gap / 1000:7.2f} s  {ACTION_NAMES.get(action, action)} {x},{y}")
+
+
+def watch(replay, speed=1.0, start=0):
+    """ Open a window and play the replay in real time """
+    root = Tk()
+    root.title("Minesweeper replay")
+    root.configure(bg="#2E3440")
+
+    player = Player(replay)
+    player.seek(start)
+    board = player.board
+    large = isinstance(board, EndlessBoard) or max(board.rows, board.cols) > 20
+    images = tile_cache.get("modern", "dark", 0.7 if large else 1, ModernTiles())
+    if isinstance(board, EndlessBoard):
+        renderer = EndlessRenderer(root, board, images, bg="#2E3440")
+        renderer.pack(fill="both", expand=True)
+    elif large:
+        renderer = VirtualTileRenderer(root, board, images, bg="#2E3440")
+        renderer.pack(fill="both", expand=True)
+    else:
+        renderer = TileRenderer(root, board, images, padding=1, bg="#2E3440")
+        renderer.pack(padx=20, pady=20)
+
+    status = Label(root, bg="#2E3440", fg="#ECEFF4", font=("Arial", 10))
+    status.pack(pady=(0, 10))
+
+    def update_status(player):
+        events = replay.events
+        seconds = events[player.position - 1][0] / 1000 if player.position else 0.0
+        state = "paused" if player.paused else f"{player.speed:g}x"
+        status.config(text=f"Move {player.position}/{len(player)}  {seconds:.1f} s  ({state})  "
+                           "Space: pause  Left/Right: step  Home/End: jump")
+
+    def toggle_pause():
+        if player.paused:
+            player.schedule()
+        else:
+            player.pause()
+        update_status(player)
+
+    def jump(position):
+        player.pause()
+        player.jump(position)
+
+    root.bind("<space>", lambda e: toggle_pause())
+    root.bind("<Left>", lambda e: jump(player.position - 1))
+    root.bind("<Right>", lambda e: jump(player.position + 1))
+    root.bind("<Home>", lambda e: jump(0))
+    root.bind("<End>", lambda e: jump(len(player)))
+
+    player.watch(renderer, speed, on_move=update_status)
+    update_status(player)
+    root.mainloop()
+
+
+def main(argv=None):
+    """ Command-line entry point """
+    parser = argparse.ArgumentParser(description="Analyse or watch recorded Minesweeper games.")
+    parser.add_argument("replay", nargs="?",
+                        help='a recording, or "last" for the most recent one '
+                             "(default: list the recordings)")
+    parser.add_argument("--watch", action="store_true", help="play the game in a window")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed when watching")
+    parser.add_argument("--start", type=int, default=0, help="move to start watching from")
+    args = parser.parse_args(argv)
+
+    if args.replay is None:
+        for path in recent_replays():
+            try:
+                replay = Replay.load(path)
+            except (OSError, ValueError):
+                continue
+            print(f"{os.path.basename(path)}  {replay.game_id}  "
+                  f"{len(replay.events)} moves  {replay.duration:.1f} s")
+        return
+
+    path = args.replay
+    if path == "last":
+        replays = recent_replays()
+        if not replays:
+            parser.error(f"no recordings in {replay_dir()}")
+        path = replays[-1]
+    elif not os.path.exists(path) and os.path.exists(os.path.join(replay_dir(), path)):
+        path = os.path.join(replay_dir(), path)
+
+    try:
+        replay = Replay.load(path)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.watch:
+        watch(replay, args.speed, args.start)
+    else:
+        analyse(replay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Batch simulation for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Plays many games without Tk, a display or any widgets, using a bot to
+choose the moves, and reports how the bot did and how fast the engine ran:
+
+    python simulate.py --games 1000 easy medium hard
+    python simulate.py --size 100x100 --density 0.15 --bot random
+    python simulate.py --bot mybots:CornerBot
+
+Games are split across worker processes. A bot is any class with a
+move(board, solver, rng) method returning the indices of the cells to
+reveal next; bots built in are listed in BOTS.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from random import Random, SystemRandom
+import argparse
+import multiprocessing
+import os
+import time
+
+from board import Board
+from probability import mine_probabilities
+from solver import Solver
+
+# The same settings as the game's difficulty menu
+DIFFICULTIES = {
+    "easy": {"size": 9, "mines": 10},
+    "medium": {"size": 16, "mines": 40},
+    "hard": {"size": 20, "mines": 80}
+}
+
+# Timed parts of a game, in the order they are reported
+PHASES = ("generate", "reveal", "solve")
+
+
+class LogicBot:
+    """ Plays every safe cell the solver finds, then the least risky guess """
+
+    def move(self, board, solver, rng):
+        """ Cells to reveal next """
+        safe, _ = solver.solve()
+        if safe:
+            return list(safe)
+        return [mine_probabilities(solver, rng=rng).safest()]
+
+
+class RandomBot:
+    """ Plays every safe cell the solver finds, then guesses at random """
+
+    def move(self, board, solver, rng):
+        """ Cells to reveal next """
+        safe, mines = solver.solve()
+        if safe:
+            return list(safe)
+        hidden = [i for i in range(board.cells)
+                  if not board.revealed[i] and i not in mines]
+        return [rng.choice(hidden)]
+
+
+BOTS = {"logic": LogicBot, "random": RandomBot}
+
+
+def load_bot(name):
+    """ A bot class from BOTS, or from "module:Class" """
+    if name in BOTS:
+        return BOTS[name]
+    module, _, attr = name.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown bot {name!r}, use one of {', '.join(BOTS)} "
+                         "or module:Class")
+    return getattr(import_module(module), attr)
+
+
+def play_game(rows, cols, mines, bot, seed, timings):
+    """ Play one game from the centre, returns (won, cells revealed) """
+    rng = Random(seed)
+    perf_counter = time.perf_counter
+
+    start = perf_counter()
+    board = Board(rows, cols, mines, seed=seed)
+    board.arm(rows // 2, cols // 2)
+    timings["generate"].append(perf_counter() - start)
+
+    solver = Solver(board)
+    moves = [board.index(rows // 2, cols // 2)]
+    while True:
+        for i in moves:
+            start = perf_counter()
+            changed = board.reveal(*board.coords(i))
+            timings["reveal"].append(perf_counter() - start)
+            if board.exploded is not None:
+                return False, board.revealed_count
+            solver.update(changed)
+        if board.is_won():
+            return True, board.revealed_count
+
+        start = perf_counter()
+        moves = bot.move(board, solver, rng)
+        timings["solve"].append(perf_counter() - start)
+
+
+def play_games(rows, cols, mines, bot_name, seeds):
+    """ Worker job: play one game per seed and return the totals """
+    bot = load_bot(bot_name)()
+    timings = {phase: [] for phase in PHASES}
+    wins = cells = 0
+    for seed in seeds:
+        won, revealed = play_game(rows, cols, mines, bot, seed, timings)
+        wins += won
+        cells += revealed
+    return wins, cells, timings
+
+
+def simulate(rows, cols, mines, games, bot="logic", seed=None, workers=None):
+    """ Play games across worker processes and return their statistics """
+    if seed is None:
+        seed = SystemRandom().getrandbits(48)
+    seeds = [seed + n for n in range(games)]
+    workers = max(min(workers or os.cpu_count() or 1, games), 1)
+    load_bot(bot)
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [play_games(rows, cols, mines, bot, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            jobs = [executor.submit(play_games, rows, cols, mines, bot, seeds[n::workers])
+                    for n in range(workers)]
+            results = [job.result() for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    timings = {phase: [] for phase in PHASES}
+    for _, _, worker_timings in results:
+        for phase in PHASES:
+            timings[phase].extend(worker_timings[phase])
+    return {
+        "games": games,
+        "wins": sum(wins for wins, _, _ in results),
+        "cells": sum(cells for _, cells, _ in results),
+        "elapsed": elapsed,
+        "timings": timings,
+        "seed": seed
+    }
+
+
+def percentile(sorted_values, fraction):
+    """ Nearest-rank percentile of an already sorted list """
+    if not sorted_values:
+        return 0.0
+    rank = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[rank]
+
+
+def report(name, stats):
+    """ Print the statistics of one simulate() run """
+    games = stats["games"]
+    elapsed = stats["elapsed"] or 1e-9
+    print(f"{name}: {games} games, seed {stats['seed']:x}")
+    print(f"  win rate     {stats['wins'] / games:8.1%}")
+    print(f"  games/sec    {games / elapsed:8.1f}")
+    print(f"  cells/sec    {stats['cells'] / elapsed:8.0f}")
+    print("  latency (ms)      p50       p90       p99       max")
+    for phase in PHASES:
+        values = sorted(stats["timings"][phase])
+        row = [percentile(values, f) * 1000 for f in (0.5, 0.9, 0.99)]
+        row.append(values[-1] * 1000 if values else 0.0)
+        print(f"  {phase:<12}" + "".join(f"{v:10.3f}" for v in row))
+
+
+def parse_size(text):
+    """ "ROWSxCOLS" or a single number for a square board """
+    rows, _, cols = text.lower().partition("x")
+    rows, cols = int(rows), int(cols or rows)
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError(f"rows and columns must be at least 1, got {text}")
+    return rows, cols
+
+
+def positive_int(text):
+    """ A whole number of at least 1 """
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    """ Command-line entry point """
+    parser = argparse.ArgumentParser(description="Play Minesweeper games with a bot "
+                                                 "and report win rate and engine speed.")
+    parser.add_argument("difficulties", nargs="*",
+                        help=f"any of {', '.join(DIFFICULTIES)} (default: all, "
+                             "unless --size is given)")
+    parser.add_argument("--games", type=positive_int, default=200, help="games per board size")
+    parser.add_argument("--size", type=parse_size, help="custom board size, e.g. 30x16")
+    parser.add_argument("--mines", type=int, help="mines on a custom board")
+    parser.add_argument("--density", type=float, default=0.15,
+                        help="mine density of a custom board if --mines is not given")
+    parser.add_argument("--bot", default="logic",
+                        help=f"{', '.join(BOTS)} or module:Class (default: logic)")
+    parser.add_argument("--seed", type=lambda text: int(text, 16),
+                        help="first game seed in hex, for repeatable runs")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    for name in args.difficulties:
+        if name not in DIFFICULTIES:
+            parser.error(f"unknown difficulty {name!r}")
+
+    runs = []
+    if args.size:
+        rows, cols = args.size
+        mines = args.mines if args.mines is not None else round(rows * cols * args.density)
+        if not 0 <= mines < rows * cols:
+            parser.error(f"a {rows}x{cols} board needs 0 to {rows * cols - 1} mines, got {mines}")
+        runs.append((f"{rows}x{cols}/{mines}", rows, cols, mines))
+    for name in args.difficulties or ([] if args.size else list(DIFFICULTIES)):
+        settings = DIFFICULTIES[name]
+        runs.append((name, settings["size"], settings["size"], settings["mines"]))
+
+    try:
+        load_bot(args.bot)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(str(error))
+
+    for name, rows, cols, mines in runs:
+        report(name, simulate(rows, cols, mines, args.games, args.bot,
+                              args.seed, args.workers))
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
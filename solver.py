@@ -0,0 +1,204 @@
+"""
+Minesweeper solver
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Works out which hidden cells are certainly safe and which are certainly
+mines using only what a player can see: the numbers on revealed cells.
+Each revealed number gives a constraint "these hidden cells hold exactly
+this many mines", and the solver applies two rules until nothing changes:
+
+- single cell: no mines left means every cell is safe, as many mines as
+  cells means every cell is a mine
+- pairs: when two constraints overlap, the cells only one of them covers
+  can sometimes be decided by comparing their mine counts
+
+The solver is incremental: tell it which cells were revealed with update()
+and the next solve() only re-examines the constraints around them. After a
+reveal much bigger than the frontier, the constraints are rebuilt from the
+board's frontier instead, which costs O(frontier) rather than O(revealed).
+"""
+
+# Reveals at least this big may rebuild from the frontier instead
+RESYNC_SIZE = 1024
+
+
+class Solver:
+    """ Deduces safe cells and mines from the visible numbers of a Board """
+
+    def __init__(self, board):
+        """ Start with nothing known about the board """
+        self.board = board
+
+        # Hidden cells proven to be mines or safe
+        self.mines = set()
+        self.safe = set()
+
+        # Revealed cell -> (frozenset of undecided neighbours, mines among them)
+        self.constraints = {}
+
+        # Revealed cells whose constraint must be rebuilt, and constraints
+        # that changed since the last pair pass
+        self.dirty = set()
+        self.changed = set()
+
+    def reset(self):
+        """ Forget everything, e.g. after the board was reset """
+        self.__init__(self.board)
+
+    def update(self, revealed):
+        """ Note newly revealed cells so the next solve() looks at them """
+        board = self.board
+        if len(revealed) >= RESYNC_SIZE and len(revealed) > 2 * len(board.frontier):
+            self.resync()
+            return
+        for i in revealed:
+            self.safe.discard(i)
+            if board.revealed[i] and not board.mines[i]:
+                self.dirty.add(i)
+            for n in board.neighbours(i):
+                if board.revealed[n]:
+                    self.dirty.add(n)
+
+    def resync(self):
+        """ Drop every constraint and rebuild them around the frontier """
+        board = self.board
+        self.safe = {i for i in self.safe if not board.revealed[i]}
+        self.constraints = {}
+        self.changed = set()
+        self.dirty = set()
+        for i in board.frontier:
+            for n in board.neighbours(i):
+                if board.revealed[n]:
+                    self.dirty.add(n)
+
+    def solve(self):
+        """ Apply the rules until nothing new can be deduced """
+        while self.dirty or self.changed:
+            while self.dirty:
+                self.rebuild()
+            self.apply_pairs()
+        return self.safe, self.mines
+
+    def rebuild(self):
+        """ Rebuild dirty constraints and apply the single cell rule """
+        board = self.board
+        dirty, self.dirty = self.dirty, set()
+        for c in dirty:
+            unknown = []
+            remaining = board.counts[c]
+            for n in board.neighbours(c):
+                if n in self.mines:
+                    remaining -= 1
+                elif not board.revealed[n] and n not in self.safe:
+                    unknown.append(n)
+
+            if not unknown:
+                self.constraints.pop(c, None)
+                continue
+
+            if remaining == 0:
+                self.mark(unknown, safe=True)
+            elif remaining == len(unknown):
+                self.mark(unknown, safe=False)
+            else:
+                constraint = (frozenset(unknown), remaining)
+                if self.constraints.get(c) != constraint:
+                    self.constraints[c] = constraint
+                    self.changed.add(c)
+                continue
+            self.constraints.pop(c, None)
+
+    def mark(self, cells, safe):
+        """ Record deduced cells and revisit the numbers around them """
+        target = self.safe if safe else self.mines
+        board = self.board
+        for i in cells:
+            if i in self.safe or i in self.mines:
+                continue
+            target.add(i)
+            for n in board.neighbours(i):
+                if board.revealed[n]:
+                    self.dirty.add(n)
+
+    def apply_pairs(self):
+        """ Compare each changed constraint with the ones it overlaps """
+        board = self.board
+        constraints = self.constraints
+        changed, self.changed = self.changed, set()
+        for a in changed:
+            if a not in constraints:
+                continue
+            cells_a, mines_a = constraints[a]
+
+            # Constraints sharing a cell with a belong to revealed cells
+            # next to one of a's undecided cells
+            others = set()
+            for i in cells_a:
+                others.update(board.neighbours(i))
+            others.discard(a)
+
+            for b in others:
+                if b not in constraints:
+                    continue
+                cells_b, mines_b = constraints[b]
+                only_a = cells_a - cells_b
+                only_b = cells_b - cells_a
+
+                # If b's extra cells must hold all of b's extra mines, they
+                # are mines and a's extra cells are safe (and vice versa)
+                if only_b and mines_b - mines_a == len(only_b):
+                    self.mark(only_b, safe=False)
+                    self.mark(only_a, safe=True)
+                elif only_a and mines_a - mines_b == len(only_a):
+                    self.mark(only_a, safe=False)
+                    self.mark(only_b, safe=True)
+                elif not only_a and only_b and mines_a == mines_b:
+                    self.mark(only_b, safe=True)
+                elif not only_b and only_a and mines_a == mines_b:
+                    self.mark(only_a, safe=True)
+                else:
+                    continue
+
+                # Both constraints changed, the rebuild will revisit them
+                if self.dirty:
+                    break
+            if self.dirty:
+                # Keep the pairs not checked yet for the next pass
+                self.changed.update(c for c in changed if c in constraints)
+                return
+
+    def frontier(self):
+        """ Split the undecided frontier into independent components
+
+        Returns a list of (cells, constraints) pairs where cells is the set
+        of undecided hidden cells and constraints lists the (cells, mines)
+        constraints that mention them. Constraints in different components
+        share no cell, so each component can be reasoned about on its own.
+        """
+        self.solve()
+
+        # Union-find over the undecided cells of all constraints
+        parent = {}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for cells, _ in self.constraints.values():
+            cells = list(cells)
+            for i in cells:
+                parent.setdefault(i, i)
+            root = find(cells[0])
+            for i in cells[1:]:
+                parent[find(i)] = root
+
+        components = {}
+        for constraint in self.constraints.values():
+            root = find(next(iter(constraint[0])))
+            cells, members = components.setdefault(root, (set(), []))
+            cells.update(constraint[0])
+            members.append(constraint)
+        return list(components.values())
+
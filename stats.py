@@ -0,0 +1,345 @@
+"""
+Game statistics for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Every finished game - won or lost - is stored as one row in an SQLite
+database in the user's data folder: difficulty, result, time, clicks,
+hints used, cells uncovered, the game ID (which includes the board seed)
+and when it was played. The database runs in WAL mode so a write never
+waits on readers, and indexes on (difficulty, won, time) and (difficulty,
+date) let the leaderboard and percentile queries read only the rows they
+need, so they stay in the millisecond range with 100k+ games stored.
+
+Writes never happen on the caller's thread. record() only queues the game;
+a background writer appends it to a journal file straight away (flushed
+and synced, one JSON line per game), then commits everything that arrived
+within BATCH_DELAY in a single transaction and empties the journal by
+atomically replacing it. If the game crashes or the database can't be
+written, the games are still in the journal, and they are written on the
+next start. Every game carries a unique token so a game that was
+committed just before a crash is not stored twice. Games that are not
+committed yet are kept in memory and counted by every query, so a game is
+on the leaderboard as soon as record() returns.
+
+Scores from the old high_scores.json are imported once, when the database
+is first created.
+"""
+from datetime import datetime
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+from paths import data_dir
+
+# Bumped whenever the tables change; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    clicks INTEGER,
+    hints INTEGER,
+    revealed INTEGER,
+    game_id TEXT,
+    date TEXT NOT NULL,
+    token TEXT
+);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (difficulty, won, time);
+CREATE INDEX IF NOT EXISTS games_by_date ON games (difficulty, date);
+CREATE UNIQUE INDEX IF NOT EXISTS games_by_token ON games (token);
+"""
+
+# Columns of a game, in the order they are inserted
+COLUMNS = ("difficulty", "won", "time", "clicks", "hints", "revealed", "game_id", "date", "token")
+INSERT = (f"INSERT OR IGNORE INTO games ({', '.join(COLUMNS)}) "
+          f"VALUES ({', '.join('?' * len(COLUMNS))})")
+
+# Tokens looked up per query when checking which unsaved games are stored
+TOKEN_BATCH = 500
+
+# Seconds the writer waits for more games before committing a batch
+BATCH_DELAY = 0.25
+
+# High score file of earlier versions, in the working directory
+LEGACY_HIGH_SCORES = "high_scores.json"
+
+
+def atomic_write(path, data):
+    """ Replace a file's contents so it is never seen half written """
+    with open(path + ".tmp", "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+
+class StatsStore:
+    """ Records finished games and answers leaderboard questions about them """
+
+    def __init__(self, path=None, legacy_path=LEGACY_HIGH_SCORES):
+        """ Open (creating if needed) the database; path defaults to the data folder """
+        if path is None:
+            path = os.path.join(data_dir(), "stats.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.journal_path = path + ".pending"
+        self.db = self.connect()
+
+        # Games recorded but not in the database yet, which the queries
+        # count too; the lock only guards swapping the list
+        self.lock = threading.Lock()
+        self.unsaved = []
+
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self.db:
+                self.db.executescript(SCHEMA)
+                self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            if version == 0 and legacy_path and os.path.exists(legacy_path):
+                self.import_json(legacy_path)
+
+        # Games a crash or a failed write left in the journal, and games
+        # that could not be journaled and wait in memory instead
+        self.pending = []
+        self.unsaved = self.read_journal()
+        self.commit_journal(self.db)
+
+        # Games waiting for the writer thread, which starts on first use
+        self.queue = queue.Queue()
+        self.writer = None
+
+    def connect(self):
+        """ A new connection to the database, one per thread """
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def record(self, difficulty, won, time, clicks=None, hints=None, revealed=None,
+               game_id=None, date=None):
+        """ Queue one finished game to be stored; date defaults to now """
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        game = {"difficulty": difficulty, "won": int(won), "time": time,
+                "clicks": clicks, "hints": hints, "revealed": revealed,
+                "game_id": game_id, "date": date, "token": uuid.uuid4().hex}
+        with self.lock:
+            self.unsaved.append(game)
+        self.queue.put(game)
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run, daemon=True)
+            self.writer.start()
+
+    def run(self):
+        """ Writer loop: journal each game at once, commit them in batches """
+        db = self.connect()
+        while True:
+            game = self.queue.get()
+            stop = game is None
+            games = [] if stop else [game]
+
+            # Gather the games that follow closely, e.g. a burst of restarts
+            deadline = time.monotonic() + BATCH_DELAY
+            while not stop:
+                self.journal(games[-1])
+                try:
+                    game = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if game is None:
+                    stop = True
+                else:
+                    games.append(game)
+
+            self.commit_journal(db)
+            for _ in range(len(games) + stop):
+                self.queue.task_done()
+            if stop:
+                db.close()
+                return
+
+    def journal(self, game):
+        """ Append a game to the journal, on disk before this returns """
+        try:
+            with open(self.journal_path, "a") as file:
+                file.write(json.dumps(game) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError:
+            # Still committed below, just not crash-proof until then
+            self.pending.append(game)
+
+    def read_journal(self):
+        """ The games in the journal; a line cut short by a crash is skipped """
+        try:
+            with open(self.journal_path, "r") as file:
+                lines = file.read().splitlines()
+        except OSError:
+            return []
+        games = []
+        for line in lines:
+            try:
+                game = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(game, dict):
+                games.append(game)
+        return games
+
+    def commit_journal(self, db):
+        """ Store every journaled game in one transaction and empty the journal """
+        games = self.read_journal() + self.pending
+        if not games:
+            return
+        # Written without the lock so a slow disk never holds up a query;
+        # until the swap below, the queries drop the games already stored
+        try:
+            with db:
+                db.executemany(INSERT, [tuple(game.get(column) for column in COLUMNS)
+                                        for game in games])
+        except sqlite3.Error:
+            # Locked or unwritable: the journal keeps them for the next try
+            return
+        committed = {game.get("token") for game in games}
+        with self.lock:
+            self.unsaved = [game for game in self.unsaved
+                            if game.get("token") not in committed]
+        self.pending.clear()
+        try:
+            atomic_write(self.journal_path, b"")
+        except OSError:
+            pass
+
+    def flush(self):
+        """ Wait until every recorded game is stored """
+        if self.writer is not None:
+            self.queue.join()
+
+    def import_json(self, path):
+        """ Add the wins from a high_scores.json file, returns how many """
+        try:
+            with open(path, "r") as file:
+                scores = json.load(file)
+            rows = [(difficulty, score["time"], score["date"])
+                    for difficulty, entries in scores.items() for score in entries]
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return 0
+        with self.db:
+            self.db.executemany("INSERT INTO games (difficulty, won, time, date) "
+                                "VALUES (?, 1, ?, ?)", rows)
+        return len(rows)
+
+    def unsaved_games(self, difficulty):
+        """ The unsaved games at a difficulty, as the writer last left them """
+        with self.lock:
+            return [game for game in self.unsaved if game["difficulty"] == difficulty]
+
+    def unstored(self, games):
+        """ The games whose token is not in the database yet
+
+        Called inside a read transaction, so a game the writer commits
+        while a query runs is either in its rows or in these games.
+        """
+        tokens = [game["token"] for game in games if game.get("token")]
+        stored = set()
+        for start in range(0, len(tokens), TOKEN_BATCH):
+            batch = tokens[start:start + TOKEN_BATCH]
+            stored.update(token for token, in self.db.execute(
+                f"SELECT token FROM games WHERE token IN ({', '.join('?' * len(batch))})",
+                batch))
+        return [game for game in games if game.get("token") not in stored]
+
+    def query(self, difficulty, sql, parameters):
+        """ The rows of a query with the unsaved games at a difficulty, both
+        read from the same snapshot so no game is missed or counted twice """
+        games = self.unsaved_games(difficulty)
+        self.db.execute("BEGIN")
+        try:
+            rows = self.db.execute(sql, parameters).fetchall()
+            games = self.unstored(games)
+        finally:
+            self.db.commit()
+        return rows, games
+
+    def leaderboard(self, difficulty, limit=5):
+        """ The fastest wins, as [{"time": seconds, "date": "YYYY-MM-DD"}, ...] """
+        rows, games = self.query(
+            difficulty,
+            "SELECT time, date FROM games WHERE difficulty = ? AND won = 1 "
+            "ORDER BY time, date LIMIT ?", (difficulty, limit))
+        rows += [(game["time"], game["date"]) for game in games if game["won"]]
+        return [{"time": time, "date": date[:10]} for time, date in sorted(rows)[:limit]]
+
+    def rank(self, difficulty, time):
+        """ Number of wins faster than time, so 0 is the best score yet """
+        rows, games = self.query(
+            difficulty,
+            "SELECT COUNT(*) FROM games WHERE difficulty = ? AND won = 1 AND time < ?",
+            (difficulty, time))
+        return rows[0][0] + sum(1 for game in games if game["won"] and game["time"] < time)
+
+    def percentile(self, difficulty, time):
+        """ Percentage of the wins at this difficulty that were slower than time """
+        total = self.wins(difficulty)
+        if not total:
+            return 0.0
+        rows, games = self.query(
+            difficulty,
+            "SELECT COUNT(*) FROM games WHERE difficulty = ? AND won = 1 AND time > ?",
+            (difficulty, time))
+        slower = rows[0][0] + sum(1 for game in games if game["won"] and game["time"] > time)
+        return 100.0 * slower / total
+
+    def wins(self, difficulty):
+        """ Number of games won at a difficulty """
+        rows, games = self.query(
+            difficulty, "SELECT COUNT(*) FROM games WHERE difficulty = ? AND won = 1",
+            (difficulty,))
+        return rows[0][0] + sum(game["won"] for game in games)
+
+    def time_at(self, difficulty, fraction):
+        """ Time of the win at a fraction of the way through the wins, fastest
+        first - e.g. 0.5 for the median - or None without wins """
+        wins = self.wins(difficulty)
+        if not wins:
+            return None
+        offset = min(int(fraction * wins), wins - 1)
+
+        # Each unsaved win faster than the one wanted moves it one place
+        # down the stored wins, so read the stored ones that could be it
+        games = [game for game in self.unsaved_games(difficulty) if game["won"]]
+        self.db.execute("BEGIN")
+        try:
+            times = [game["time"] for game in self.unstored(games)]
+            start = max(offset - len(times), 0)
+            times += [time for time, in self.db.execute(
+                "SELECT time FROM games WHERE difficulty = ? AND won = 1 "
+                "ORDER BY time LIMIT ? OFFSET ?", (difficulty, offset - start + 1, start))]
+        finally:
+            self.db.commit()
+        return sorted(times)[offset - start]
+
+    def summary(self, difficulty):
+        """ (games played, games won) at a difficulty """
+        rows, games = self.query(
+            difficulty,
+            "SELECT COUNT(*), COALESCE(SUM(won), 0) FROM games WHERE difficulty = ?",
+            (difficulty,))
+        played, won = rows[0]
+        return played + len(games), won + sum(game["won"] for game in games)
+
+    def close(self):
+        """ Store the queued games and close the database """
+        if self.writer is not None:
+            # Whatever is not committed in time is already in the journal
+            self.queue.put(None)
+            self.writer.join(timeout=5)
+            self.writer = None
+        self.db.close()
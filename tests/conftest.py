@@ -0,0 +1,13 @@
+"""
+Shared setup for the Minesweeper tests
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Run from the repository root with "pytest"; the helpers shared by the
+solver and probability tests are in positions.py.
+"""
+import os
+import sys
+
+# Tests import the game modules from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
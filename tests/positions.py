@@ -0,0 +1,51 @@
+"""
+Random board positions for the solver and probability tests
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+The solver and the probability engine are checked against brute force:
+every mine layout that fits what the player can see is listed on boards
+small enough for that to be quick.
+"""
+from itertools import combinations
+
+from board import Board
+from solver import Solver
+
+# Small board shapes (rows, cols, mines) brute force can cover
+SHAPES = ((4, 4, 3), (5, 5, 5), (4, 6, 5), (3, 8, 4))
+
+# How many random positions each test checks
+POSITIONS = 200
+
+
+def random_position(rng):
+    """ A board part way through a game, with a solver that has seen it
+
+    The board is armed at a random cell and a few more safe cells are
+    revealed so that the numbers overlap in different ways. Returns None
+    when the first click already won the game.
+    """
+    rows, cols, mines = rng.choice(SHAPES)
+    board = Board(rows, cols, mines, seed=rng.getrandbits(32))
+    board.arm(rng.randrange(rows), rng.randrange(cols))
+    board.reveal(*board.first_click)
+    safe = [i for i in range(board.cells) if not board.mines[i] and not board.revealed[i]]
+    for i in rng.sample(safe, rng.randrange(min(len(safe), 4) + 1)):
+        board.reveal(*board.coords(i))
+    if board.is_won():
+        return None
+
+    solver = Solver(board)
+    solver.update([i for i in range(board.cells) if board.revealed[i]])
+    return board, solver
+
+
+def layouts(board):
+    """ Every mine layout of the hidden cells that fits the visible numbers """
+    hidden = [i for i in range(board.cells) if not board.revealed[i]]
+    numbers = [i for i in range(board.cells) if board.revealed[i]]
+    for mines in combinations(hidden, board.mine_count):
+        mines = set(mines)
+        if all(sum(n in mines for n in board.neighbours(i)) == board.counts[i]
+               for i in numbers):
+            yield mines
@@ -0,0 +1,41 @@
+"""
+Tests of the board engine
+Developed by Muhammad Saeed (https://github.com/mid0o)
+"""
+from board import Board, neighbour_tables
+
+
+def test_neighbour_tables_keep_one_size():
+    """ Only the latest board size keeps its shared neighbour table """
+    first = Board(30, 20, 10)
+    Board(40, 40, 10)
+    assert list(neighbour_tables) == [(40, 40)]
+    assert first.neighbours(first.index(0, 0)) == (1, 20, 21)
+
+
+def test_pack_roundtrip_armed():
+    """ An armed board comes back with the same mines and first click """
+    board = Board(9, 12, 20, seed=0xA7)
+    board.arm(4, 5)
+    copy = Board.unpack(board.pack())
+    assert copy.mines == board.mines
+    assert copy.counts == board.counts
+    assert copy.first_click == (4, 5)
+    assert copy.is_armed
+
+
+def test_pack_roundtrip_unarmed():
+    """ A board packed before its first click still clears that click """
+    board = Board(9, 12, 40, seed=0xA8)
+    board.prepare()
+    copy = Board.unpack(board.pack())
+    assert copy.mines == board.mines
+    assert copy.prepared and not copy.is_armed
+    assert copy.first_click is None
+
+    # Arm at a mine so the move is needed
+    x, y = copy.coords(copy.mines.index(1))
+    copy.arm(x, y)
+    assert copy.is_armed
+    assert not copy.mines[copy.index(x, y)]
+    assert sum(copy.mines) == 40
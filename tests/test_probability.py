@@ -0,0 +1,74 @@
+"""
+Tests of the mine probability engine
+Developed by Muhammad Saeed (https://github.com/mid0o)
+"""
+from random import Random
+import time
+
+import pytest
+
+from positions import POSITIONS, layouts, random_position
+
+from board import Board
+import probability
+from probability import mine_probabilities
+from solver import Solver
+
+
+def test_probabilities_match_brute_force():
+    """ Exact probabilities are the share of fitting layouts with a mine there """
+    rng = Random(0xB0A7D)
+    for _ in range(POSITIONS):
+        position = random_position(rng)
+        if position is None:
+            continue
+        board, solver = position
+        probabilities = mine_probabilities(solver, time_budget=10, rng=rng)
+        assert probabilities.exact
+
+        possible = list(layouts(board))
+        for i in range(board.cells):
+            if board.revealed[i]:
+                assert probabilities[i] == 0.0
+                continue
+            expected = sum(i in layout for layout in possible) / len(possible)
+            assert probabilities[i] == pytest.approx(expected, abs=1e-9)
+
+
+def test_small_components_are_exact_without_budget():
+    """ A spent budget still enumerates components of EXACT_SIZE cells or fewer """
+    rng = Random(0xE8AC7)
+    probability.component_cache.clear()
+    for _ in range(POSITIONS):
+        position = random_position(rng)
+        if position is None:
+            continue
+        _, solver = position
+        assert mine_probabilities(solver, time_budget=0, rng=rng).exact
+
+
+def test_many_components_stay_within_budget():
+    """ Components too big to enumerate share one budget between them """
+    board = Board(100, 100, 2000, seed=0xB16)
+    board.prepare()
+
+    # Short strips of revealed cells, each bordered by a component far
+    # too big to enumerate
+    for x in range(5, 100, 10):
+        for start in (5, 40, 75):
+            for y in range(start, start + 20):
+                if not board.mines[board.index(x, y)]:
+                    board.reveal(x, y)
+    solver = Solver(board)
+    solver.update([i for i in range(board.cells) if board.revealed[i]])
+    components = solver.frontier()
+    assert sum(len(cells) > 12 for cells, _ in components) >= 20
+
+    probability.component_cache.clear()
+    budget = 0.25
+    start = time.perf_counter()
+    probabilities = mine_probabilities(solver, time_budget=budget, rng=Random(0))
+    elapsed = time.perf_counter() - start
+    assert not probabilities.exact
+    assert elapsed < budget + 0.1
+    assert probabilities.safest() is not None
@@ -0,0 +1,45 @@
+"""
+Tests of the constraint-propagation solver
+Developed by Muhammad Saeed (https://github.com/mid0o)
+"""
+from random import Random
+
+from positions import POSITIONS, layouts, random_position
+
+
+def test_solve_matches_brute_force():
+    """ Every cell the solver decides is decided the same way by every layout """
+    rng = Random(0x5017E)
+    for _ in range(POSITIONS):
+        position = random_position(rng)
+        if position is None:
+            continue
+        board, solver = position
+        safe, mines = solver.solve()
+
+        possible = list(layouts(board))
+        assert possible, "the real layout always fits"
+        for i in safe:
+            assert not any(i in layout for layout in possible)
+        for i in mines:
+            assert all(i in layout for layout in possible)
+
+
+def test_solve_finds_forced_cells():
+    """ A number with as many hidden neighbours as its count marks them all as mines """
+    rng = Random(0xF0CE)
+    found = 0
+    for _ in range(POSITIONS):
+        position = random_position(rng)
+        if position is None:
+            continue
+        board, solver = position
+        safe, mines = solver.solve()
+        for i in range(board.cells):
+            if not board.revealed[i] or not board.counts[i]:
+                continue
+            hidden = [n for n in board.neighbours(i) if not board.revealed[n]]
+            if len(hidden) == board.counts[i]:
+                assert set(hidden) <= mines
+                found += 1
+    assert found
@@ -0,0 +1,27 @@
+"""
+Tests of the game statistics store
+Developed by Muhammad Saeed (https://github.com/mid0o)
+"""
+import stats
+from stats import StatsStore
+
+
+def test_committed_game_is_not_counted_twice(tmp_path):
+    """ A game stored but still in unsaved, as between the writer's commit
+    and its swap, is counted once """
+    store = StatsStore(str(tmp_path / "stats.sqlite3"), legacy_path=None)
+    store.record("easy", True, 20)
+    store.flush()
+
+    game = {"difficulty": "easy", "won": 1, "time": 5, "date": "2026-01-01 00:00:00",
+            "token": "committed-not-swapped"}
+    store.unsaved.append(game)
+    with store.db:
+        store.db.execute(stats.INSERT, tuple(game.get(column) for column in stats.COLUMNS))
+
+    assert store.wins("easy") == 2
+    assert store.summary("easy") == (2, 2)
+    assert store.rank("easy", 20) == 1
+    assert [score["time"] for score in store.leaderboard("easy")] == [5, 20]
+    assert store.time_at("easy", 0.99) == 20
+    store.close()
@@ -0,0 +1,286 @@
+"""
+Tile images for Minesweeper
+Developed by Muhammad Saeed (https://github.com/mid0o)
+
+Tile images are decoded once per process and kept for every later game, so
+starting, restarting or switching tile style does not touch the disk again.
+Images are keyed by (style, theme, scale); the scaled variants are built
+with Tk's zoom/subsample as soon as a style is first loaded.
+
+Classic tiles are the PNG files shipped in images/. Modern tiles are drawn
+with PIL the first time they are needed and saved as a single sprite atlas
+with a JSON manifest in the user's cache folder, so later launches only
+read one image.
+"""
+from fractions import Fraction
+from tkinter import PhotoImage
+import hashlib
+import json
+import os
+
+from paths import cache_dir
+
+# Order of the tiles in a modern atlas
+TILE_NAMES = ["tile", "mine", "flag", "clicked_mine", "wrong_flag", "hint"] + \
+             [f"num{i}" for i in range(9)]
+
+# Bump when the drawing code changes so old atlases are not reused
+ATLAS_VERSION = 1
+
+# Colours of the modern tiles for each theme
+PALETTES = {
+    "dark": {
+        "hidden": "#3A3F4B", "light_edge": "#565D70", "dark_edge": "#23262E",
+        "open": "#1E2129", "open_edge": "#2C303A", "exploded": "#CF6679",
+        "mine": "#0D0D0D", "mine_shine": "#9E9E9E", "flag": "#FF5252",
+        "pole": "#E0E0E0", "cross": "#FFD54F", "hint": "#BB86FC",
+        "numbers": ["#000000", "#4FC3F7", "#81C784", "#E57373", "#BA68C8",
+                    "#FFB74D", "#4DD0E1", "#F06292", "#B0BEC5"]
+    },
+    "light": {
+        "hidden": "#C9CED8", "light_edge": "#F2F4F8", "dark_edge": "#8E95A3",
+        "open": "#ECEFF3", "open_edge": "#D3D7DE", "exploded": "#E57373",
+        "mine": "#212121", "mine_shine": "#BDBDBD", "flag": "#D32F2F",
+        "pole": "#424242", "cross": "#B00020", "hint": "#6200EE",
+        "numbers": ["#000000", "#1565C0", "#2E7D32", "#C62828", "#6A1B9A",
+                    "#EF6C00", "#00838F", "#AD1457", "#455A64"]
+    }
+}
+
+# Seven segment layout of the digits drawn on number tiles
+SEGMENTS = {
+    1: "bc", 2: "abged", 3: "abgcd", 4: "fgbc",
+    5: "afgcd", 6: "afgedc", 7: "abc", 8: "abcdefg"
+}
+
+
+class TileFiles:
+    """ A tile set stored as one image file per tile """
+
+    def __init__(self, paths, number_paths):
+        """ paths maps tile names to files, number_paths lists num0-num8 """
+        self.paths = paths
+        self.number_paths = number_paths
+
+    def load(self, theme):
+        """ Read every tile image once, even if a path is used twice """
+        decoded = {}
+
+        def load(path):
+            if path not in decoded:
+                decoded[path] = PhotoImage(file=path)
+            return decoded[path]
+
+        images = {name: load(path) for name, path in self.paths.items()}
+        images["numbers"] = [load(path) for path in self.number_paths]
+        return images
+
+
+class TileAtlas:
+    """ A tile set stored as one sprite sheet and a manifest """
+
+    def __init__(self, path, manifest):
+        """ manifest["tiles"] maps tile names to [x, y, width, height] """
+        self.path = path
+        self.manifest = manifest
+
+    def load(self, theme=None):
+        """ Cut the tile images out of the sprite sheet """
+        sheet = PhotoImage(file=self.path)
+
+        def cut(name):
+            x, y, width, height = self.manifest["tiles"][name]
+            tile = PhotoImage(width=width, height=height)
+            tile.tk.call(tile, "copy", sheet, "-from", x, y, x + width, y + height)
+            return tile
+
+        images = {name: cut(name) for name in TILE_NAMES if not name.startswith("num")}
+        images["numbers"] = [cut(f"num{i}") for i in range(9)]
+        return images
+
+
+class ModernTiles:
+    """ The generated modern tile set, one atlas per theme """
+
+    def __init__(self, tile_size=20, directory=None):
+        """ directory defaults to the user's cache folder """
+        self.tile_size = tile_size
+        self.directory = directory
+
+    def load(self, theme):
+        """ Load (generating it first if needed) the atlas for a theme """
+        return create_modern_tiles(theme, self.tile_size, self.directory).load()
+
+
+def create_modern_tiles(theme="dark", tile_size=20, directory=None):
+    """ Get the modern tile atlas for a theme, drawing it if not cached """
+    directory = directory or cache_dir()
+    params = {"version": ATLAS_VERSION, "theme": theme,
+              "tile_size": tile_size, "palette": PALETTES[theme]}
+    key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    path = os.path.join(directory, f"modern-{theme}-{key}.png")
+    manifest_path = os.path.join(directory, f"modern-{theme}-{key}.json")
+
+    # Reuse the atlas from an earlier launch when the parameters match
+    if os.path.exists(path) and os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "r") as file:
+                manifest = json.load(file)
+            if manifest.get("params") == params:
+                return TileAtlas(path, manifest)
+        except (OSError, ValueError):
+            pass
+
+    from PIL import Image
+
+    sheet = Image.new("RGBA", (tile_size * len(TILE_NAMES), tile_size))
+    manifest = {"params": params, "tiles": {}}
+    for n, name in enumerate(TILE_NAMES):
+        sheet.paste(draw_tile(name, PALETTES[theme], tile_size), (n * tile_size, 0))
+        manifest["tiles"][name] = [n * tile_size, 0, tile_size, tile_size]
+
+    # Write to temporary names first so a crash never leaves half a file
+    os.makedirs(directory, exist_ok=True)
+    sheet.save(path + ".tmp", format="PNG")
+    with open(manifest_path + ".tmp", "w") as file:
+        json.dump(manifest, file)
+    os.replace(path + ".tmp", path)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return TileAtlas(path, manifest)
+
+
+def draw_tile(name, palette, size):
+    """ Draw one modern tile as a PIL image """
+    from PIL import Image, ImageDraw
+
+    # Draw at four times the size and scale down for smooth edges
+    s = size * 4
+    img = Image.new("RGBA", (s, s), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    edge = max(s // 12, 2)
+
+    if name in ("tile", "flag", "wrong_flag", "hint"):
+        # Raised tile: light top-left edge, dark bottom-right edge
+        draw.rounded_rectangle([0, 0, s - 1, s - 1], radius=edge * 2, fill=palette["dark_edge"])
+        draw.rounded_rectangle([0, 0, s - edge - 1, s - edge - 1], radius=edge * 2,
+                               fill=palette["light_edge"])
+        draw.rounded_rectangle([edge, edge, s - edge - 1, s - edge - 1], radius=edge,
+                               fill=palette["hidden"])
+    else:
+        # Flat, opened tile
+        background = palette["exploded"] if name == "clicked_mine" else palette["open"]
+        draw.rectangle([0, 0, s - 1, s - 1], fill=palette["open_edge"])
+        draw.rectangle([edge // 2, edge // 2, s - edge // 2 - 1, s - edge // 2 - 1],
+                       fill=background)
+
+    if name in ("mine", "clicked_mine"):
+        draw_mine(draw, palette, s)
+    elif name in ("flag", "wrong_flag"):
+        draw_flag(draw, palette, s)
+        if name == "wrong_flag":
+            width = max(s // 12, 1)
+            draw.line([s * 0.2, s * 0.2, s * 0.8, s * 0.8], fill=palette["cross"], width=width)
+            draw.line([s * 0.2, s * 0.8, s * 0.8, s * 0.2], fill=palette["cross"], width=width)
+    elif name == "hint":
+        draw.rounded_rectangle([edge, edge, s - edge - 1, s - edge - 1], radius=edge,
+                               outline=palette["hint"], width=edge)
+        draw_mine(draw, palette, s, scale=0.6)
+    elif name.startswith("num") and name != "num0":
+        number = int(name[3:])
+        draw_digit(draw, number, palette["numbers"][number], s)
+
+    return img.resize((size, size), Image.LANCZOS)
+
+
+def draw_mine(draw, palette, s, scale=1.0):
+    """ A round mine with spikes in the middle of the tile """
+    c = s / 2
+    r = s * 0.22 * scale
+    spike = s * 0.34 * scale
+    width = max(int(s * 0.06 * scale), 1)
+    for dx, dy in ((1, 0), (0, 1), (0.7, 0.7), (0.7, -0.7)):
+        draw.line([c - dx * spike, c - dy * spike, c + dx * spike, c + dy * spike],
+                  fill=palette["mine"], width=width)
+    draw.ellipse([c - r, c - r, c + r, c + r], fill=palette["mine"])
+    shine = r * 0.35
+    draw.ellipse([c - r * 0.5 - shine / 2, c - r * 0.5 - shine / 2,
+                  c - r * 0.5 + shine / 2, c - r * 0.5 + shine / 2],
+                 fill=palette["mine_shine"])
+
+
+def draw_flag(draw, palette, s):
+    """ A pennant on a pole, standing on a small base """
+    pole = s * 0.55
+    width = max(int(s * 0.05), 1)
+    draw.line([pole, s * 0.2, pole, s * 0.75], fill=palette["pole"], width=width)
+    draw.polygon([(pole, s * 0.2), (s * 0.25, s * 0.33), (pole, s * 0.46)],
+                 fill=palette["flag"])
+    draw.rectangle([s * 0.35, s * 0.72, s * 0.72, s * 0.78], fill=palette["pole"])
+
+
+def draw_digit(draw, number, color, s):
+    """ A seven segment digit centred in the tile """
+    w = s * 0.34
+    h = s * 0.56
+    t = s * 0.08
+    left = (s - w) / 2
+    top = (s - h) / 2
+    mid = top + h / 2
+
+    # Each segment as a rectangle: a top, b top right, c bottom right,
+    # d bottom, e bottom left, f top left, g middle
+    boxes = {
+        "a": (left, top, left + w, top + t),
+        "b": (left + w - t, top, left + w, mid + t / 2),
+        "c": (left + w - t, mid - t / 2, left + w, top + h),
+        "d": (left, top + h - t, left + w, top + h),
+        "e": (left, mid - t / 2, left + t, top + h),
+        "f": (left, top, left + t, mid + t / 2),
+        "g": (left, mid - t / 2, left + w, mid + t / 2)
+    }
+    for segment in SEGMENTS[number]:
+        draw.rectangle(boxes[segment], fill=color)
+
+
+class TileCache:
+    """ Decoded tile images shared by every game in the process """
+
+    # Scales built up front whenever a style is loaded
+    scales = (1, 0.7)
+
+    def __init__(self):
+        """ Start with an empty cache """
+        self.images = {}
+
+    def get(self, style, theme, scale, source):
+        """ The image set for (style, theme, scale), loading it if needed """
+        key = (style, theme, scale)
+        if key not in self.images:
+            base = source.load(theme)
+            for variant in set(self.scales) | {scale}:
+                self.images[(style, theme, variant)] = self.scale(base, variant)
+        return self.images[key]
+
+    def scale(self, images, factor):
+        """ A copy of an image set resized by factor """
+        if factor == 1:
+            return images
+
+        # Tk can only zoom and subsample by whole numbers, so scale by the
+        # closest simple fraction: 0.7 becomes zoom 7, subsample 10
+        fraction = Fraction(factor).limit_denominator(10)
+
+        def resize(img):
+            return img.zoom(fraction.numerator).subsample(fraction.denominator)
+
+        scaled = {name: resize(img) for name, img in images.items() if name != "numbers"}
+        scaled["numbers"] = [resize(img) for img in images["numbers"]]
+        return scaled
+
+    def clear(self):
+        """ Forget every cached image """
+        self.images.clear()
+
+
+# One cache for the whole process
+tile_cache = TileCache()